@@ -9,25 +9,25 @@ import logging
 import signal
 import threading
 import time
-from config import Config
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from config import get_config
 from telegram_bot import TelegramBot
 from webhook_handler import WebhookHandler
 from web_interface import WebInterface
+from utils import setup_logging
 
 # Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('bot.log', mode='a')
-    ]
-)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 class BotLauncher:
     """Launcher class for managing bot lifecycle."""
     
+    __slots__ = (
+        'config', 'telegram_bot', 'webhook_handler', 'web_interface',
+        'running', 'pool', 'futures', '_stop',
+    )
+    
     def __init__(self):
         """Initialize the bot launcher."""
         self.config = None
@@ -35,7 +35,9 @@ class BotLauncher:
         self.webhook_handler = None
         self.web_interface = None
         self.running = False
-        self.threads = []
+        self.pool = None
+        self.futures = []
+        self._stop = threading.Event()
     
     def setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown."""
@@ -52,7 +54,7 @@ class BotLauncher:
         try:
             # Initialize configuration
             logger.info("Initializing configuration...")
-            self.config = Config()
+            self.config = get_config()
             self.config.validate()
             
             # Initialize Telegram bot
@@ -74,33 +76,26 @@ class BotLauncher:
             raise
     
     def start_services(self):
-        """Start all services in separate threads."""
+        """Start all services on a shared thread pool."""
         try:
-            # Start web interface
-            web_thread = threading.Thread(
-                target=self.web_interface.run_server,
-                name="WebInterface",
-                daemon=True
-            )
-            web_thread.start()
-            self.threads.append(web_thread)
-            
-            # Wait for web interface to start
-            time.sleep(2)
-            logger.info(f"Web interface started on http://{self.config.web_host}:{self.config.web_port}")
-            
-            # Start webhook handler
-            webhook_thread = threading.Thread(
-                target=self.webhook_handler.run_server,
-                name="WebhookHandler",
-                daemon=True
-            )
-            webhook_thread.start()
-            self.threads.append(webhook_thread)
-            
-            # Wait for webhook handler to start
-            time.sleep(2)
-            logger.info(f"Webhook handler started on http://{self.config.webhook_host}:{self.config.webhook_port}")
+            self.pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bot")
+            services = [
+                ("Web interface", self.web_interface, self.config.web_host, self.config.web_port),
+                ("Webhook handler", self.webhook_handler, self.config.webhook_host, self.config.webhook_port),
+            ]
+            
+            # Submit every service first so they bind in parallel, then wait
+            # on their readiness events rather than sleeping
+            pending = []
+            for name, service, host, port in services:
+                ready = threading.Event()
+                future = self.pool.submit(service.run_server, ready)
+                self.futures.append(future)
+                pending.append((name, ready, future, host, port))
+            
+            for name, ready, future, host, port in pending:
+                self.wait_until_ready(name, ready, future)
+                logger.info(f"{name} started on http://{host}:{port}")
             
             logger.info("All services started successfully")
             
@@ -108,6 +103,16 @@ class BotLauncher:
             logger.error(f"Failed to start services: {e}")
             raise
     
+    def wait_until_ready(self, name, ready, future, timeout=10):
+        """Block until a service has bound its socket, failing fast if it exits."""
+        deadline = time.monotonic() + timeout
+        while not ready.wait(0.05):
+            if future.done():
+                future.result()  # Re-raise the startup error, if any
+                raise RuntimeError(f"{name} exited during startup")
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"{name} did not start within {timeout}s")
+    
     def run(self):
         """Main run method."""
         try:
@@ -118,10 +123,16 @@ class BotLauncher:
             
             # Initialize components
             self.initialize_components()
+            if self._stop.is_set():
+                return
             
             # Start services
             self.start_services()
             
+            # A signal during startup has already shut everything down
+            if self._stop.is_set():
+                return
+            
             # Mark as running
             self.running = True
             
@@ -132,6 +143,10 @@ class BotLauncher:
         except KeyboardInterrupt:
             logger.info("Bot stopped by user")
         except Exception as e:
+            if self._stop.is_set():
+                # Services torn down by a shutdown signal fail their startup wait
+                logger.info(f"Startup interrupted by shutdown: {e}")
+                return
             logger.error(f"Fatal error: {e}")
             sys.exit(1)
         finally:
@@ -139,8 +154,11 @@ class BotLauncher:
     
     def shutdown(self):
         """Graceful shutdown of all components."""
-        if not self.running:
+        # The stop event makes shutdown idempotent and also covers services
+        # that were started before a later startup step failed
+        if self._stop.is_set():
             return
+        self._stop.set()
         
         logger.info("Shutting down bot...")
         self.running = False
@@ -149,12 +167,23 @@ class BotLauncher:
         if self.telegram_bot:
             self.telegram_bot.stop()
         
-        # Wait for threads to finish (with timeout)
-        for thread in self.threads:
-            if thread.is_alive():
-                thread.join(timeout=5)
-                if thread.is_alive():
-                    logger.warning(f"Thread {thread.name} did not shut down gracefully")
+        # Stop the servers so their pool workers can return
+        for service in (self.web_interface, self.webhook_handler):
+            if service:
+                service.shutdown_server()
+        
+        # Wait for services to finish, bounded by one overall deadline
+        deadline = time.monotonic() + 5
+        for future in self.futures:
+            try:
+                future.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                logger.warning("Service did not shut down gracefully")
+            except Exception as e:
+                logger.error(f"Service exited with error: {e}")
+        
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
         
         logger.info("Bot shutdown complete")
 
@@ -4,53 +4,141 @@ Handles environment variables and validation.
 """
 
 import os
+import re
 import logging
-from dotenv import load_dotenv
+import secrets
+import functools
 
 logger = logging.getLogger(__name__)
 
+# Bit assigned to each notifiable GitHub event type
+_EVENT_BIT = {
+    'push': 1,
+    'issues': 2,
+    'pull_request': 4,
+    'release': 8,
+}
+
+# Project directory, where the .env file lives regardless of the working directory
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Whitespace-preceded comment at the end of an unquoted value
+_INLINE_COMMENT_RE = re.compile(r'\s+#.*$')
+
+def load_env_file(path=None):
+    """
+    Load KEY=VALUE pairs from a .env file into os.environ in one pass.
+    
+    Variables already present in the environment take precedence, matching
+    python-dotenv's default behaviour.
+    
+    Args:
+        path: Path to the .env file; defaults to the one next to this module
+        
+    Returns:
+        Dictionary of the values read from the file
+    """
+    if path is None:
+        path = os.path.join(_BASE_DIR, '.env')
+    
+    values = {}
+    try:
+        with open(path, encoding='utf-8') as env_file:
+            for line in env_file:
+                line = line.strip()
+                if not line or line.startswith('#') or '=' not in line:
+                    continue
+                key, value = line.split('=', 1)
+                key = key.strip()
+                if key.startswith('export '):
+                    key = key[7:].strip()
+                value = value.strip()
+                end = value.find(value[0], 1) if value and value[0] in '"\'' else -1
+                if end > 0:
+                    # Quoted: keep everything between the quotes, drop what follows
+                    value = value[1:end]
+                else:
+                    value = _INLINE_COMMENT_RE.sub('', value)
+                values[key] = value
+    except FileNotFoundError:
+        return values
+    
+    os.environ.update({key: value for key, value in values.items() if key not in os.environ})
+    return values
+
 class Config:
     """Configuration class for the bot."""
     
+    __slots__ = (
+        'telegram_token', 'allowed_chat_ids', 'telegram_webhook_url', 'telegram_webhook_secret',
+        'github_token', 'github_username', 'github_webhook_secret',
+        'webhook_host', 'webhook_port', 'webhook_max_payload', 'web_host', 'web_port', 'server_threads',
+        'debug_mode', 'rate_limit_requests', 'rate_limit_window', 'max_tracked_chats',
+        'notify_on_push', 'notify_on_issues', 'notify_on_pull_requests', 'notify_on_releases',
+        '_notify_mask', '_webhook_url',
+    )
+    
     def __init__(self):
         """Initialize configuration by loading environment variables."""
-        load_dotenv()
+        load_env_file()
+        # Snapshot the environment once instead of querying it per setting
+        env = dict(os.environ)
         
         # Telegram Bot Configuration
-        self.telegram_token = os.getenv('TELEGRAM_BOT_TOKEN', '')
-        self.allowed_chat_ids = self._parse_chat_ids(os.getenv('ALLOWED_CHAT_IDS', ''))
+        self.telegram_token = env.get('TELEGRAM_BOT_TOKEN', '')
+        self.allowed_chat_ids = self._parse_chat_ids(env.get('ALLOWED_CHAT_IDS', ''))
+        # Public HTTPS URL of the webhook server's /telegram route; polling is used when unset
+        self.telegram_webhook_url = env.get('TELEGRAM_WEBHOOK_URL', '')
+        self.telegram_webhook_secret = env.get('TELEGRAM_WEBHOOK_SECRET', '')
+        if self.telegram_webhook_url and not self.telegram_webhook_secret:
+            # Webhook mode never accepts unauthenticated updates; a generated
+            # token is registered with setWebhook at startup
+            self.telegram_webhook_secret = secrets.token_urlsafe(32)
         
         # GitHub Configuration
-        self.github_token = os.getenv('GITHUB_TOKEN', '')
-        self.github_username = os.getenv('GITHUB_USERNAME', '')
-        self.github_webhook_secret = os.getenv('GITHUB_WEBHOOK_SECRET', '')
+        self.github_token = env.get('GITHUB_TOKEN', '')
+        self.github_username = env.get('GITHUB_USERNAME', '')
+        self.github_webhook_secret = env.get('GITHUB_WEBHOOK_SECRET', '')
         
         # Server Configuration
-        self.webhook_host = os.getenv('WEBHOOK_HOST', '0.0.0.0')
-        self.webhook_port = int(os.getenv('WEBHOOK_PORT', '8000'))
-        self.web_host = os.getenv('WEB_HOST', '0.0.0.0')
-        self.web_port = int(os.getenv('WEB_PORT', '5000'))
+        self.webhook_host = env.get('WEBHOOK_HOST', '0.0.0.0')
+        self.webhook_port = int(env.get('WEBHOOK_PORT', '8000'))
+        # Largest accepted webhook body in bytes; GitHub caps payloads at 25 MB
+        self.webhook_max_payload = int(env.get('WEBHOOK_MAX_PAYLOAD', str(25 * 1024 * 1024)))
+        self.web_host = env.get('WEB_HOST', '0.0.0.0')
+        self.web_port = int(env.get('WEB_PORT', '5000'))
+        # Worker threads per HTTP server (webhook handler and web interface)
+        self.server_threads = int(env.get('SERVER_THREADS', '8'))
         
         # Bot Configuration
-        self.debug_mode = os.getenv('DEBUG_MODE', 'False').lower() == 'true'
-        self.rate_limit_requests = int(os.getenv('RATE_LIMIT_REQUESTS', '10'))
-        self.rate_limit_window = int(os.getenv('RATE_LIMIT_WINDOW', '60'))
+        self.debug_mode = env.get('DEBUG_MODE', 'False').lower() == 'true'
+        self.rate_limit_requests = int(env.get('RATE_LIMIT_REQUESTS', '10'))
+        self.rate_limit_window = int(env.get('RATE_LIMIT_WINDOW', '60'))
+        self.max_tracked_chats = int(env.get('MAX_TRACKED_CHATS', '100000'))
         
         # Notification Settings
-        self.notify_on_push = os.getenv('NOTIFY_ON_PUSH', 'True').lower() == 'true'
-        self.notify_on_issues = os.getenv('NOTIFY_ON_ISSUES', 'True').lower() == 'true'
-        self.notify_on_pull_requests = os.getenv('NOTIFY_ON_PULL_REQUESTS', 'True').lower() == 'true'
-        self.notify_on_releases = os.getenv('NOTIFY_ON_RELEASES', 'True').lower() == 'true'
+        self.notify_on_push = env.get('NOTIFY_ON_PUSH', 'True').lower() == 'true'
+        self.notify_on_issues = env.get('NOTIFY_ON_ISSUES', 'True').lower() == 'true'
+        self.notify_on_pull_requests = env.get('NOTIFY_ON_PULL_REQUESTS', 'True').lower() == 'true'
+        self.notify_on_releases = env.get('NOTIFY_ON_RELEASES', 'True').lower() == 'true'
+        
+        self._notify_mask = (
+            (_EVENT_BIT['push'] if self.notify_on_push else 0)
+            | (_EVENT_BIT['issues'] if self.notify_on_issues else 0)
+            | (_EVENT_BIT['pull_request'] if self.notify_on_pull_requests else 0)
+            | (_EVENT_BIT['release'] if self.notify_on_releases else 0)
+        )
+        self._webhook_url = f"http://{self.webhook_host}:{self.webhook_port}/webhook"
         
     def _parse_chat_ids(self, chat_ids_str):
         """Parse comma-separated chat IDs."""
         if not chat_ids_str:
-            return []
+            return frozenset()
         try:
-            return [int(chat_id.strip()) for chat_id in chat_ids_str.split(',') if chat_id.strip()]
+            return frozenset(int(chat_id.strip()) for chat_id in chat_ids_str.split(',') if chat_id.strip())
         except ValueError:
             logger.warning("Invalid chat IDs format in ALLOWED_CHAT_IDS")
-            return []
+            return frozenset()
     
     def validate(self):
         """Validate required configuration parameters."""
@@ -74,10 +162,18 @@ class Config:
     
     def is_chat_allowed(self, chat_id):
         """Check if a chat ID is allowed to use the bot."""
-        if not self.allowed_chat_ids:
-            return True  # Allow all if no restriction is set
-        return chat_id in self.allowed_chat_ids
+        # Allow all if no restriction is set; otherwise a hashed frozenset lookup
+        return not self.allowed_chat_ids or chat_id in self.allowed_chat_ids
+    
+    def should_notify(self, event_type):
+        """Check if notifications are enabled for a GitHub event type."""
+        return bool(self._notify_mask & _EVENT_BIT.get(event_type, 0))
     
     def get_webhook_url(self):
         """Get the webhook URL for GitHub."""
-        return f"http://{self.webhook_host}:{self.webhook_port}/webhook"
+        return self._webhook_url
+
+@functools.lru_cache(maxsize=1)
+def get_config():
+    """Return the process-wide configuration, loading .env only once."""
+    return Config()
@@ -2,16 +2,46 @@
 GitHub API client for repository management and data fetching.
 """
 
-import requests
+import asyncio
+import functools
 import logging
-from typing import Dict, List, Optional
-from utils import escape_markdown, format_timestamp
+import time
+import httpx
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from utils import escape_markdown, format_timestamp, json_loads
 
 logger = logging.getLogger(__name__)
 
+# Response cache settings (seconds / entries)
+LISTING_CACHE_TTL = 60
+PROFILE_CACHE_TTL = 300
+ACTIVITY_CACHE_TTL = 10
+CACHE_MAX_SIZE = 512
+RENDER_CACHE_SIZE = 256
+# Entries older than ttl are served stale while refreshing in the background,
+# until they reach ttl * STALE_TTL_FACTOR and must be refetched inline
+STALE_TTL_FACTOR = 3
+VALIDATOR_CACHE_SIZE = 1024
+
+# Connection pool and retry tuning
+POOL_SIZE = 32
+KEEPALIVE_EXPIRY = 30
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.2
+MAX_RETRY_DELAY = 10
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+# Static section headers shared by the formatters
+_USER_STATS_HEADER = "📊 **Stats:**\n"
+_REPO_STATS_HEADER = "📊 **Statistics:**\n"
+_REPO_DETAILS_HEADER = "\n🔧 **Details:**\n"
+
 class GitHubClient:
     """GitHub API client for interacting with GitHub repositories."""
     
+    __slots__ = ('token', 'username', 'base_url', 'client', '_cache', '_validators', '_refreshing')
+    
     def __init__(self, token: str, username: str):
         """
         Initialize GitHub client.
@@ -23,52 +53,272 @@ class GitHubClient:
         self.token = token
         self.username = username
         self.base_url = "https://api.github.com"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'token {token}',
-            'Accept': 'application/vnd.github.v3+json',
-            'User-Agent': 'GitHub-Telegram-Bot/1.0'
-        })
+        # One pooled HTTP/2 client shared by every request; independent
+        # endpoints are multiplexed over the same connection. The transport
+        # retries failed connection attempts, _fetch retries 5xx responses.
+        # httpx already negotiates gzip via Accept-Encoding.
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=POOL_SIZE,
+                max_keepalive_connections=POOL_SIZE,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            ),
+            retries=MAX_RETRIES
+        )
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                'Authorization': f'token {token}',
+                'Accept': 'application/vnd.github.v3+json',
+                'User-Agent': 'GitHub-Telegram-Bot/1.0'
+            },
+            timeout=10,
+            transport=transport
+        )
+        
+        # (endpoint, params) -> (fetched_at, ttl, parsed JSON)
+        self._cache: Dict[tuple, tuple] = {}
+        # (url, params) -> (etag, last_modified, parsed JSON, next URL), LRU ordered
+        self._validators: OrderedDict = OrderedDict()
+        # Cache key -> in-flight background refresh task
+        self._refreshing: Dict[tuple, asyncio.Task] = {}
     
-    def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+    async def aclose(self):
+        """Cancel background refreshes and close the HTTP connection pool."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await self.client.aclose()
+    
+    @staticmethod
+    def _cache_key(endpoint: str, params: Dict = None) -> tuple:
+        """Build a hashable key for an endpoint and its query parameters."""
+        return (endpoint, frozenset(params.items()) if params else None)
+    
+    def _cache_get(self, key: tuple) -> Optional[Tuple[Any, bool]]:
         """
-        Make a request to the GitHub API.
+        Look up a cached response.
+        
+        Returns:
+            Tuple of (value, is_stale), or None if missing or past its hard expiry
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        fetched_at, ttl, value = entry
+        age = time.monotonic() - fetched_at
+        if age >= ttl * STALE_TTL_FACTOR:
+            del self._cache[key]
+            return None
+        return value, age >= ttl
+    
+    def prune_cache(self) -> int:
+        """
+        Drop cache entries past their hard expiry.
+        
+        Returns:
+            Number of entries removed
+        """
+        now = time.monotonic()
+        expired = [
+            key for key, (fetched_at, ttl, _) in self._cache.items()
+            if now - fetched_at >= ttl * STALE_TTL_FACTOR
+        ]
+        for key in expired:
+            del self._cache[key]
+        return len(expired)
+    
+    def _cache_put(self, key: tuple, value: Any, ttl: float):
+        """Store a response, evicting expired or oldest entries when full."""
+        now = time.monotonic()
+        if len(self._cache) >= CACHE_MAX_SIZE:
+            self.prune_cache()
+            if len(self._cache) >= CACHE_MAX_SIZE:
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (now, ttl, value)
+    
+    async def _cached(self, key: tuple, ttl: float, load: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Serve a cached value, refreshing it in the background once stale.
         
         Args:
-            endpoint: API endpoint
+            key: Cache key
+            ttl: Freshness window in seconds (0 bypasses the cache)
+            load: Zero-argument coroutine function that fetches and caches the value
+            
+        Returns:
+            Cached or freshly loaded value
+        """
+        if ttl:
+            hit = self._cache_get(key)
+            if hit is not None:
+                value, stale = hit
+                if stale and key not in self._refreshing:
+                    task = asyncio.get_running_loop().create_task(load())
+                    self._refreshing[key] = task
+                    task.add_done_callback(lambda _task: self._refreshing.pop(key, None))
+                return value
+        return await load()
+    
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before retrying, honouring Retry-After when present."""
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(int(retry_after), MAX_RETRY_DELAY)
+        return min(RETRY_BACKOFF * (2 ** attempt), MAX_RETRY_DELAY)
+    
+    async def _fetch(self, url: str, params: Dict = None) -> Optional[Tuple[Any, Optional[str]]]:
+        """
+        Fetch a single page from the GitHub API.
+        
+        Pages seen before are revalidated with If-None-Match/If-Modified-Since;
+        a 304 reuses the stored body and does not count against the rate limit.
+        
+        Args:
+            url: API endpoint or absolute page URL
             params: Query parameters
             
         Returns:
-            JSON response or None on error
+            Tuple of (JSON response, next page URL or None), or None on error
         """
+        key = self._cache_key(url, params)
+        validator = self._validators.get(key)
+        headers = None
+        if validator is not None:
+            self._validators.move_to_end(key)
+            etag, last_modified = validator[0], validator[1]
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
         try:
-            url = f"{self.base_url}{endpoint}"
-            response = self.session.get(url, params=params, timeout=10)
+            for attempt in range(MAX_RETRIES + 1):
+                response = await self.client.get(url, params=params, headers=headers)
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    break
+                await asyncio.sleep(self._retry_delay(response, attempt))
             
-            if response.status_code == 200:
-                return response.json()
+            if response.status_code == 304 and validator is not None:
+                return validator[2], validator[3]
+            elif response.status_code == 200:
+                next_link = response.links.get('next')
+                data = json_loads(response.content)
+                next_url = next_link['url'] if next_link else None
+                
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                if etag or last_modified:
+                    self._validators[key] = (etag, last_modified, data, next_url)
+                    self._validators.move_to_end(key)
+                    if len(self._validators) > VALIDATOR_CACHE_SIZE:
+                        self._validators.popitem(last=False)
+                
+                return data, next_url
             elif response.status_code == 404:
-                logger.warning(f"Resource not found: {endpoint}")
+                logger.warning(f"Resource not found: {url}")
                 return None
             elif response.status_code == 403:
-                logger.error(f"API rate limit exceeded or forbidden: {endpoint}")
+                logger.error(f"API rate limit exceeded or forbidden: {url}")
                 return None
             else:
                 logger.error(f"GitHub API error {response.status_code}: {response.text}")
                 return None
                 
-        except requests.RequestException as e:
-            logger.error(f"Request error for {endpoint}: {e}")
+        except httpx.HTTPError as e:
+            logger.error(f"Request error for {url}: {e}")
             return None
         except Exception as e:
-            logger.error(f"Unexpected error for {endpoint}: {e}")
+            logger.error(f"Unexpected error for {url}: {e}")
             return None
     
-    def get_rate_limit(self) -> Optional[Dict]:
+    async def _make_request(self, endpoint: str, params: Dict = None, ttl: float = 0) -> Optional[Dict]:
+        """
+        Make a request to the GitHub API.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            ttl: Seconds to cache a successful response (0 disables caching)
+            
+        Returns:
+            JSON response or None on error
+        """
+        key = self._cache_key(endpoint, params)
+        
+        async def load():
+            page = await self._fetch(endpoint, params)
+            if page is None:
+                return None
+            data = page[0]
+            if ttl:
+                self._cache_put(key, data, ttl)
+            return data
+        
+        return await self._cached(key, ttl, load)
+    
+    async def _paginate(self, endpoint: str, params: Dict, limit: int,
+                        items_key: str = None) -> AsyncIterator[Dict]:
+        """
+        Yield listing items page by page, following the Link rel="next" header.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters for the first page
+            limit: Maximum number of items to yield
+            items_key: Key holding the items when a page is an object (e.g. search)
+            
+        Yields:
+            Item dictionaries, stopping as soon as limit is reached
+        """
+        url = endpoint
+        while url and limit > 0:
+            page = await self._fetch(url, params)
+            if page is None:
+                return
+            
+            data, url = page
+            items = data.get(items_key, []) if items_key else data
+            if not items:
+                return
+            
+            for item in items[:limit]:
+                yield item
+            limit -= len(items)
+            params = None  # The next link already carries the query string
+    
+    async def _get_listing(self, endpoint: str, params: Dict, limit: int,
+                           ttl: float = 0, items_key: str = None) -> List[Dict]:
+        """
+        Collect up to limit items from a paginated listing.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            limit: Maximum number of items to return
+            ttl: Seconds to cache a non-empty result (0 disables caching)
+            items_key: Key holding the items when a page is an object
+            
+        Returns:
+            List of item dictionaries
+        """
+        key = (endpoint, frozenset(params.items()), limit)
+        
+        async def load():
+            items = [item async for item in self._paginate(endpoint, params, limit, items_key)]
+            if ttl and items:
+                self._cache_put(key, items, ttl)
+            return items
+        
+        return await self._cached(key, ttl, load)
+    
+    async def get_rate_limit(self) -> Optional[Dict]:
         """Get current API rate limit status."""
-        return self._make_request('/rate_limit')
+        return await self._make_request('/rate_limit')
     
-    def get_user_info(self, username: str = None) -> Optional[Dict]:
+    async def get_user_info(self, username: str = None) -> Optional[Dict]:
         """
         Get user information.
         
@@ -83,9 +333,9 @@ class GitHubClient:
         else:
             endpoint = "/user"
         
-        return self._make_request(endpoint)
+        return await self._make_request(endpoint, ttl=PROFILE_CACHE_TTL)
     
-    def get_user_repositories(self, username: str = None, limit: int = 10) -> List[Dict]:
+    async def get_user_repositories(self, username: str = None, limit: int = 10) -> List[Dict]:
         """
         Get user repositories.
         
@@ -106,10 +356,9 @@ class GitHubClient:
             'per_page': min(limit, 100)
         }
         
-        result = self._make_request(endpoint, params)
-        return result if result else []
+        return await self._get_listing(endpoint, params, limit, ttl=LISTING_CACHE_TTL)
     
-    def get_repository_details(self, owner: str, repo: str) -> Optional[Dict]:
+    async def get_repository_details(self, owner: str, repo: str) -> Optional[Dict]:
         """
         Get detailed repository information.
         
@@ -121,9 +370,9 @@ class GitHubClient:
             Repository information dictionary
         """
         endpoint = f"/repos/{owner}/{repo}"
-        return self._make_request(endpoint)
+        return await self._make_request(endpoint, ttl=LISTING_CACHE_TTL)
     
-    def get_repository_commits(self, owner: str, repo: str, limit: int = 10) -> List[Dict]:
+    async def get_repository_commits(self, owner: str, repo: str, limit: int = 10) -> List[Dict]:
         """
         Get repository commits.
         
@@ -140,10 +389,9 @@ class GitHubClient:
             'per_page': min(limit, 100)
         }
         
-        result = self._make_request(endpoint, params)
-        return result if result else []
+        return await self._get_listing(endpoint, params, limit, ttl=ACTIVITY_CACHE_TTL)
     
-    def get_repository_issues(self, owner: str, repo: str, limit: int = 10) -> List[Dict]:
+    async def get_repository_issues(self, owner: str, repo: str, limit: int = 10) -> List[Dict]:
         """
         Get repository issues.
         
@@ -161,10 +409,9 @@ class GitHubClient:
             'per_page': min(limit, 100)
         }
         
-        result = self._make_request(endpoint, params)
-        return result if result else []
+        return await self._get_listing(endpoint, params, limit, ttl=ACTIVITY_CACHE_TTL)
     
-    def search_repositories(self, query: str, limit: int = 10) -> List[Dict]:
+    async def search_repositories(self, query: str, limit: int = 10) -> List[Dict]:
         """
         Search repositories.
         
@@ -183,10 +430,9 @@ class GitHubClient:
             'per_page': min(limit, 100)
         }
         
-        result = self._make_request(endpoint, params)
-        if result and 'items' in result:
-            return result['items']
-        return []
+        return await self._get_listing(
+            endpoint, params, limit, ttl=LISTING_CACHE_TTL, items_key='items'
+        )
     
     def format_user_info(self, user_info: Dict) -> str:
         """
@@ -198,48 +444,21 @@ class GitHubClient:
         Returns:
             Formatted user information string
         """
-        login = user_info.get('login', 'Unknown')
-        name = user_info.get('name', 'No name')
-        bio = user_info.get('bio', 'No bio')
-        public_repos = user_info.get('public_repos', 0)
-        followers = user_info.get('followers', 0)
-        following = user_info.get('following', 0)
-        location = user_info.get('location', 'Unknown')
-        company = user_info.get('company', 'Unknown')
-        blog = user_info.get('blog', '')
-        created_at = user_info.get('created_at', '')
-        
-        message = f"👤 **GitHub Profile: {escape_markdown(login)}**\n\n"
-        
-        if name and name != 'No name':
-            message += f"🏷️ **Name:** {escape_markdown(name)}\n"
-        
-        if bio and bio != 'No bio':
-            message += f"📝 **Bio:** {escape_markdown(bio)}\n"
-        
-        message += f"📊 **Stats:**\n"
-        message += f"• 📦 Repositories: {public_repos}\n"
-        message += f"• 👥 Followers: {followers}\n"
-        message += f"• 👁️ Following: {following}\n"
-        
-        if location and location != 'Unknown':
-            message += f"📍 **Location:** {escape_markdown(location)}\n"
-        
-        if company and company != 'Unknown':
-            message += f"🏢 **Company:** {escape_markdown(company)}\n"
-        
-        if blog:
-            message += f"🌐 **Website:** {escape_markdown(blog)}\n"
-        
-        if created_at:
-            join_date = format_timestamp(created_at)
-            message += f"📅 **Joined:** {join_date}\n"
-        
-        profile_url = user_info.get('html_url', '')
-        if profile_url:
-            message += f"\n🔗 [View Profile]({profile_url})"
-        
-        return message
+        # Every field that affects the output is part of the cache key, so a
+        # profile is only rendered again once one of them changes
+        return _render_user_info(
+            user_info.get('login', 'Unknown'),
+            user_info.get('name', 'No name'),
+            user_info.get('bio', 'No bio'),
+            user_info.get('public_repos', 0),
+            user_info.get('followers', 0),
+            user_info.get('following', 0),
+            user_info.get('location', 'Unknown'),
+            user_info.get('company', 'Unknown'),
+            user_info.get('blog', ''),
+            user_info.get('created_at', ''),
+            user_info.get('html_url', '')
+        )
     
     def format_repository_info(self, repo_info: Dict) -> str:
         """
@@ -251,45 +470,87 @@ class GitHubClient:
         Returns:
             Formatted repository information string
         """
-        name = repo_info.get('name', 'Unknown')
-        full_name = repo_info.get('full_name', 'Unknown')
-        description = repo_info.get('description', 'No description') or 'No description'
-        language = repo_info.get('language', 'Unknown')
-        stars = repo_info.get('stargazers_count', 0)
-        forks = repo_info.get('forks_count', 0)
-        watchers = repo_info.get('watchers_count', 0)
-        open_issues = repo_info.get('open_issues_count', 0)
-        size = repo_info.get('size', 0)
-        default_branch = repo_info.get('default_branch', 'main')
-        private = repo_info.get('private', False)
-        created_at = repo_info.get('created_at', '')
-        updated_at = repo_info.get('updated_at', '')
-        html_url = repo_info.get('html_url', '')
-        
-        message = f"📦 **Repository: {escape_markdown(full_name)}**\n\n"
-        message += f"📝 **Description:** {escape_markdown(description)}\n\n"
-        
-        message += f"📊 **Statistics:**\n"
-        message += f"• ⭐ Stars: {stars}\n"
-        message += f"• 🍴 Forks: {forks}\n"
-        message += f"• 👁️ Watchers: {watchers}\n"
-        message += f"• 🐛 Open Issues: {open_issues}\n"
-        message += f"• 📏 Size: {size} KB\n"
-        
-        message += f"\n🔧 **Details:**\n"
-        message += f"• 💻 Language: {escape_markdown(language)}\n"
-        message += f"• 🌿 Default Branch: {escape_markdown(default_branch)}\n"
-        message += f"• 🔒 Visibility: {'Private' if private else 'Public'}\n"
-        
-        if created_at:
-            created_date = format_timestamp(created_at)
-            message += f"• 📅 Created: {created_date}\n"
-        
-        if updated_at:
-            updated_date = format_timestamp(updated_at)
-            message += f"• 🔄 Updated: {updated_date}\n"
-        
-        if html_url:
-            message += f"\n🔗 [View Repository]({html_url})"
-        
-        return message
+        return _render_repository_info(
+            repo_info.get('full_name', 'Unknown'),
+            repo_info.get('description', 'No description') or 'No description',
+            repo_info.get('language', 'Unknown'),
+            repo_info.get('stargazers_count', 0),
+            repo_info.get('forks_count', 0),
+            repo_info.get('watchers_count', 0),
+            repo_info.get('open_issues_count', 0),
+            repo_info.get('size', 0),
+            repo_info.get('default_branch', 'main'),
+            repo_info.get('private', False),
+            repo_info.get('created_at', ''),
+            repo_info.get('updated_at', ''),
+            repo_info.get('html_url', '')
+        )
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_user_info(login, name, bio, public_repos, followers, following,
+                      location, company, blog, created_at, profile_url) -> str:
+    """Render a user profile message; memoised on the displayed fields."""
+    parts: List[str] = [f"👤 **GitHub Profile: {escape_markdown(login)}**\n\n"]
+    append = parts.append
+    
+    if name and name != 'No name':
+        append(f"🏷️ **Name:** {escape_markdown(name)}\n")
+    
+    if bio and bio != 'No bio':
+        append(f"📝 **Bio:** {escape_markdown(bio)}\n")
+    
+    append(
+        f"{_USER_STATS_HEADER}"
+        f"• 📦 Repositories: {public_repos}\n"
+        f"• 👥 Followers: {followers}\n"
+        f"• 👁️ Following: {following}\n"
+    )
+    
+    if location and location != 'Unknown':
+        append(f"📍 **Location:** {escape_markdown(location)}\n")
+    
+    if company and company != 'Unknown':
+        append(f"🏢 **Company:** {escape_markdown(company)}\n")
+    
+    if blog:
+        append(f"🌐 **Website:** {escape_markdown(blog)}\n")
+    
+    if created_at:
+        append(f"📅 **Joined:** {format_timestamp(created_at)}\n")
+    
+    if profile_url:
+        append(f"\n🔗 [View Profile]({profile_url})")
+    
+    return "".join(parts)
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_repository_info(full_name, description, language, stars, forks, watchers,
+                            open_issues, size, default_branch, private,
+                            created_at, updated_at, html_url) -> str:
+    """Render a repository message; memoised on the displayed fields."""
+    parts: List[str] = [
+        f"📦 **Repository: {escape_markdown(full_name)}**\n\n"
+        f"📝 **Description:** {escape_markdown(description)}\n\n"
+        f"{_REPO_STATS_HEADER}"
+        f"• ⭐ Stars: {stars}\n"
+        f"• 🍴 Forks: {forks}\n"
+        f"• 👁️ Watchers: {watchers}\n"
+        f"• 🐛 Open Issues: {open_issues}\n"
+        f"• 📏 Size: {size} KB\n"
+        f"{_REPO_DETAILS_HEADER}"
+        f"• 💻 Language: {escape_markdown(language)}\n"
+        f"• 🌿 Default Branch: {escape_markdown(default_branch)}\n"
+        f"• 🔒 Visibility: {'Private' if private else 'Public'}\n"
+    ]
+    append = parts.append
+    
+    if created_at:
+        append(f"• 📅 Created: {format_timestamp(created_at)}\n")
+    
+    if updated_at:
+        append(f"• 🔄 Updated: {format_timestamp(updated_at)}\n")
+    
+    if html_url:
+        append(f"\n🔗 [View Repository]({html_url})")
+    
+    return "".join(parts)
@@ -5,85 +5,60 @@ Handles all Telegram bot commands and interactions.
 
 import logging
 import asyncio
+import re
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from telegram._update import Update
 from telegram._inline.inlinekeyboardbutton import InlineKeyboardButton
 from telegram._inline.inlinekeyboardmarkup import InlineKeyboardMarkup
 from telegram._bot import Bot
+from telegram._linkpreviewoptions import LinkPreviewOptions
 from telegram.constants import ParseMode
+from telegram.error import BadRequest
+from telegram.request import HTTPXRequest
 from github_client import GitHubClient
 from config import Config
-from utils import escape_markdown, format_timestamp
+from utils import escape_markdown, extract_command_tail, format_timestamp
 
 logger = logging.getLogger(__name__)
 
-class TelegramBot:
-    """Telegram bot for GitHub integration."""
-    
-    def __init__(self, config: Config):
-        """
-        Initialize Telegram bot.
-        
-        Args:
-            config: Configuration object
-        """
-        self.config = config
-        self.github_client = GitHubClient(config.github_token, config.github_username)
-        self.bot = Bot(token=config.telegram_token)
-        self.running = False
-        
-        # Rate limiting
-        self.rate_limits = defaultdict(list)
-        
-    def is_rate_limited(self, chat_id):
-        """Check if a chat is rate limited."""
-        now = time.time()
-        window_start = now - self.config.rate_limit_window
-        
-        # Clean old requests
-        self.rate_limits[chat_id] = [
-            req_time for req_time in self.rate_limits[chat_id] 
-            if req_time > window_start
-        ]
-        
-        # Check rate limit
-        if len(self.rate_limits[chat_id]) >= self.config.rate_limit_requests:
-            return True
-        
-        # Add current request
-        self.rate_limits[chat_id].append(now)
-        return False
-    
-    async def check_permissions(self, update: Update):
-        """Check if the user has permission to use the bot."""
-        if not update.effective_chat or not update.message:
-            return False
-            
-        chat_id = update.effective_chat.id
-        
-        if not self.config.is_chat_allowed(chat_id):
-            await update.message.reply_text(
-                "❌ You are not authorized to use this bot.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-            return False
-        
-        if self.is_rate_limited(chat_id):
-            await update.message.reply_text(
-                "⏰ Rate limit exceeded. Please wait before making more requests.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-            return False
-        
-        return True
+# Outgoing connections available for concurrent notification sends
+NOTIFICATION_POOL_SIZE = 32
 
-    async def start_command(self, update: Update, context=None):
-        """Handle /start command."""
-        if not await self.check_permissions(update):
-            return
-            
-        welcome_message = """
+# Maximum number of updates handled concurrently
+MAX_CONCURRENT_UPDATES = 64
+
+# Long-poll duration in seconds and updates fetched per round-trip
+# (Telegram's maximums); python-telegram-bot extends the read timeout to match
+POLL_TIMEOUT = 30
+POLL_BATCH_SIZE = 100
+
+# Seconds between sweeps of expired GitHub cache entries
+CACHE_SWEEP_INTERVAL = 60
+
+# Seconds before a rate-limited chat is told about the limit again
+RATE_LIMIT_NOTICE_INTERVAL = 30
+
+# Bot-wide outbound budget matching Telegram's 30 messages per second limit
+OUTBOUND_RATE = 30.0
+OUTBOUND_BURST = 30.0
+
+# Telegram's limit on the text of a single message
+MAX_MESSAGE_LENGTH = 4096
+
+# Notifications are buffered per chat and sent together every flush
+# interval, or as soon as a chat has this many waiting
+NOTIFICATION_FLUSH_INTERVAL = 3.0
+NOTIFICATION_BUFFER_SIZE = 20
+NOTIFICATION_SEPARATOR = "\n\n"
+
+# List replies carry several links; skip Telegram's preview of the first one
+_NO_PREVIEW = LinkPreviewOptions(is_disabled=True)
+
+# "/command[@bot] owner/repo" with trailing text ignored
+_REPO_RE = re.compile(r'^/\w+(?:@\S+)?\s+([\w.-]+)/([\w.-]+)(?:\s|$)')
+
+WELCOME_MESSAGE = """
 🎯 **Welcome to GitHub-Telegram Sync Bot!** 🎯
 
 ✨ **Your intelligent GitHub companion, powered by modern AI** ✨
@@ -128,16 +103,9 @@ class TelegramBot:
 **Ready to supercharge your GitHub experience?**
 **Type `/profile` or `/help` to begin your journey!** 🚀✨
 """
-        
-        if update.message:
-            await update.message.reply_text(welcome_message, parse_mode=ParseMode.MARKDOWN)
 
-    async def help_command(self, update: Update, context=None):
-        """Handle /help command."""
-        if not await self.check_permissions(update):
-            return
-            
-        help_message = """
+# Formatted once per bot with the configured rate limit
+HELP_TEMPLATE = """
 🔧 **GitHub-Telegram Bot - Complete Command Reference**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -212,13 +180,151 @@ class TelegramBot:
 🔸 Webhook integration available for real-time repository monitoring
 
 **Need help with a specific command? Just try it out - the bot provides helpful error messages and suggestions!**
-""".format(
-    rate_limit=self.config.rate_limit_requests,
-    window=self.config.rate_limit_window
-)
+"""
+
+def _first_arg(text):
+    """Return the first argument after the command word, or None if there is none."""
+    # Split at most twice so pasted trailing text is never tokenized
+    parts = text.split(None, 2)
+    return parts[1] if len(parts) > 1 else None
+
+class TelegramBot:
+    """Telegram bot for GitHub integration."""
+    
+    def __init__(self, config: Config):
+        """
+        Initialize Telegram bot.
+        
+        Args:
+            config: Configuration object
+        """
+        self.config = config
+        self.github_client = GitHubClient(config.github_token, config.github_username)
+        # The default request pool holds a single connection, which would
+        # serialize concurrent sends; use a larger HTTP/2 pool instead
+        self.bot = Bot(
+            token=config.telegram_token,
+            request=HTTPXRequest(connection_pool_size=NOTIFICATION_POOL_SIZE, http_version="2")
+        )
+        self.running = False
+        self.loop = None
+        self._main_task = None
+        # Set by stop(); honoured even if stop() runs before the loop exists
+        self._stop_requested = False
         
-        if update.message:
-            await update.message.reply_text(help_message, parse_mode=ParseMode.MARKDOWN)
+        # In-flight update handlers and the cap on how many run at once
+        self._pending: set[asyncio.Task] = set()
+        self._handler_slots = asyncio.Semaphore(MAX_CONCURRENT_UPDATES)
+        
+        # Notifications waiting for the next flush, chat_id -> messages
+        self._outbox: defaultdict[int, list[str]] = defaultdict(list)
+        # Batches taken off the outbox and still being sent; awaited, not cancelled, on shutdown
+        self._batch_sends: set[asyncio.Task] = set()
+        
+        # Rate limiting: token bucket per chat, chat_id -> (tokens, last_refill)
+        # Least recently seen chats are evicted once max_tracked_chats is exceeded
+        self.rate_limits: OrderedDict[int, tuple[float, float]] = OrderedDict()
+        self._rate_burst = float(config.rate_limit_requests)
+        self._rate_per_second = config.rate_limit_requests / max(config.rate_limit_window, 1)
+        # chat_id -> when the chat was last sent a rate limit notice
+        self._last_rl_notice: dict[int, float] = {}
+        
+        # Outbound token bucket shared by replies and notifications
+        self._send_tokens = OUTBOUND_BURST
+        self._send_last = time.monotonic()
+        
+        # Static replies, built once
+        self._welcome_msg = WELCOME_MESSAGE
+        self._help_msg = HELP_TEMPLATE.format(
+            rate_limit=config.rate_limit_requests,
+            window=config.rate_limit_window
+        )
+        
+        # Command dispatch table
+        self._handlers = {
+            '/start': self.start_command,
+            '/help': self.help_command,
+            '/profile': self.profile_command,
+            '/repos': self.repos_command,
+            '/repo': self.repo_command,
+            '/commits': self.commits_command,
+            '/issues': self.issues_command,
+            '/search': self.search_command,
+            '/status': self.status_command,
+        }
+        
+    def is_rate_limited(self, chat_id):
+        """Check if a chat is rate limited (token bucket, O(1) per check)."""
+        now = time.monotonic()
+        tokens, last = self.rate_limits.get(chat_id, (self._rate_burst, now))
+        
+        # Refill for the time elapsed since the last request, capped at burst
+        tokens = min(self._rate_burst, tokens + (now - last) * self._rate_per_second)
+        limited = tokens < 1.0
+        self.rate_limits[chat_id] = (tokens if limited else tokens - 1.0, now)
+        self.rate_limits.move_to_end(chat_id)
+        while len(self.rate_limits) > self.config.max_tracked_chats:
+            evicted, _ = self.rate_limits.popitem(last=False)
+            self._last_rl_notice.pop(evicted, None)
+        return limited
+    
+    async def _throttle_send(self):
+        """Wait until the bot-wide outbound token bucket allows another message."""
+        now = time.monotonic()
+        tokens = min(OUTBOUND_BURST, self._send_tokens + (now - self._send_last) * OUTBOUND_RATE)
+        
+        # Reserve a token up front; concurrent senders queue behind the debt
+        self._send_tokens = tokens - 1.0
+        self._send_last = now
+        if self._send_tokens < 0:
+            await asyncio.sleep(-self._send_tokens / OUTBOUND_RATE)
+
+    async def _reply(self, update: Update, text, preview=True):
+        """Reply to the update's message with Markdown text, if it has a message."""
+        message = update.message
+        if message:
+            await self._throttle_send()
+            await message.reply_text(
+                text,
+                parse_mode=ParseMode.MARKDOWN,
+                link_preview_options=None if preview else _NO_PREVIEW
+            )
+
+    async def check_permissions(self, update: Update):
+        """Check if the user has permission to use the bot."""
+        if not update.effective_chat or not update.message:
+            return False
+            
+        chat_id = update.effective_chat.id
+        
+        if not self.config.is_chat_allowed(chat_id):
+            await self._reply(update, "❌ You are not authorized to use this bot.")
+            return False
+        
+        if self.is_rate_limited(chat_id):
+            # Notify once per interval; further rejections are dropped silently
+            # so a flooding chat cannot spend the outbound budget on notices
+            now = time.monotonic()
+            if now - self._last_rl_notice.get(chat_id, float('-inf')) > RATE_LIMIT_NOTICE_INTERVAL:
+                self._last_rl_notice[chat_id] = now
+                await self._reply(update, "⏰ Rate limit exceeded. Please wait before making more requests.")
+            return False
+        
+        return True
+
+    async def start_command(self, update: Update, context=None):
+        """Handle /start command."""
+        if not await self.check_permissions(update):
+            return
+            
+        await self._reply(update, self._welcome_msg)
+
+    async def help_command(self, update: Update, context=None):
+        """Handle /help command."""
+        if not await self.check_permissions(update):
+            return
+            
+        await self._reply(update, self._help_msg)
 
     async def profile_command(self, update: Update, context=None):
         """Handle /profile command."""
@@ -230,30 +336,19 @@ class TelegramBot:
             if not update.message or not update.message.text:
                 return
                 
-            message_text = update.message.text
-            parts = message_text.split()
-            username = parts[1] if len(parts) > 1 else None
+            username = _first_arg(update.message.text)
             
-            user_info = self.github_client.get_user_info(username)
+            user_info = await self.github_client.get_user_info(username)
             if not user_info:
-                if update.message:
-                    await update.message.reply_text(
-                        "❌ User not found or API error occurred.",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
+                await self._reply(update, "❌ User not found or API error occurred.")
                 return
             
             formatted_info = self.github_client.format_user_info(user_info)
-            if update.message:
-                await update.message.reply_text(formatted_info, parse_mode=ParseMode.MARKDOWN)
+            await self._reply(update, formatted_info)
             
         except Exception as e:
             logger.error(f"Error in profile command: {e}")
-            if update.message:
-                await update.message.reply_text(
-                    "❌ An error occurred while fetching profile information.",
-                    parse_mode=ParseMode.MARKDOWN
-                )
+            await self._reply(update, "❌ An error occurred while fetching profile information.")
 
     async def repos_command(self, update: Update, context=None):
         """Handle /repos command."""
@@ -265,17 +360,11 @@ class TelegramBot:
             if not update.message or not update.message.text:
                 return
                 
-            message_text = update.message.text
-            parts = message_text.split()
-            username = parts[1] if len(parts) > 1 else None
+            username = _first_arg(update.message.text)
             
-            repositories = self.github_client.get_user_repositories(username, limit=10)
+            repositories = await self.github_client.get_user_repositories(username, limit=10)
             if not repositories:
-                if update.message:
-                    await update.message.reply_text(
-                        "❌ No repositories found or API error occurred.",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
+                await self._reply(update, "❌ No repositories found or API error occurred.")
                 return
             
             repo_list = "\n".join([
@@ -284,16 +373,34 @@ class TelegramBot:
             ])
             
             message = f"📚 **Repositories:**\n\n{repo_list}"
-            if update.message:
-                await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await self._reply(update, message, preview=False)
             
         except Exception as e:
             logger.error(f"Error in repos command: {e}")
-            if update.message:
-                await update.message.reply_text(
-                    "❌ An error occurred while fetching repositories.",
-                    parse_mode=ParseMode.MARKDOWN
-                )
+            await self._reply(update, "❌ An error occurred while fetching repositories.")
+
+    async def _parse_repo_command(self, update: Update, usage: str):
+        """
+        Extract owner and repository from a "/command owner/repo" message.
+        
+        Args:
+            update: Telegram update carrying the command
+            usage: Usage hint shown when the argument is missing or malformed
+            
+        Returns:
+            Tuple of (owner, repo), or None after replying with the usage hint
+        """
+        message_text = update.message.text
+        match = _REPO_RE.match(message_text)
+        if match:
+            return match.group(1), match.group(2)
+        
+        if _first_arg(message_text) is None:
+            error = f"❌ Please specify a repository: `{usage}`"
+        else:
+            error = f"❌ Invalid format. Use: `{usage}`"
+        await self._reply(update, error)
+        return None
 
     async def repo_command(self, update: Update, context=None):
         """Handle /repo command."""
@@ -305,46 +412,23 @@ class TelegramBot:
             if not update.message or not update.message.text:
                 return
                 
-            message_text = update.message.text
-            parts = message_text.split()
-            if len(parts) < 2:
-                if update.message:
-                    await update.message.reply_text(
-                        "❌ Please specify a repository: `/repo owner/repo`",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
+            parsed = await self._parse_repo_command(update, "/repo owner/repo")
+            if not parsed:
                 return
             
-            repo_path = parts[1]
-            if '/' not in repo_path:
-                if update.message:
-                    await update.message.reply_text(
-                        "❌ Invalid format. Use: `/repo owner/repo`",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                return
-            
-            owner, repo = repo_path.split('/', 1)
-            repo_info = self.github_client.get_repository_details(owner, repo)
+            owner, repo = parsed
+            repo_path = f"{owner}/{repo}"
+            repo_info = await self.github_client.get_repository_details(owner, repo)
             if not repo_info:
-                if update.message:
-                    await update.message.reply_text(
-                        f"❌ Repository `{repo_path}` not found or API error occurred.",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
+                await self._reply(update, f"❌ Repository `{repo_path}` not found or API error occurred.")
                 return
             
             formatted_info = self.github_client.format_repository_info(repo_info)
-            if update.message:
-                await update.message.reply_text(formatted_info, parse_mode=ParseMode.MARKDOWN)
+            await self._reply(update, formatted_info)
             
         except Exception as e:
             logger.error(f"Error in repo command: {e}")
-            if update.message:
-                await update.message.reply_text(
-                    "❌ An error occurred while fetching repository information.",
-                    parse_mode=ParseMode.MARKDOWN
-                )
+            await self._reply(update, "❌ An error occurred while fetching repository information.")
 
     async def commits_command(self, update: Update, context=None):
         """Handle /commits command."""
@@ -353,33 +437,18 @@ class TelegramBot:
             
         try:
             # Extract repo path from message text
-            message_text = update.message.text
-            parts = message_text.split()
-            if len(parts) < 2:
-                await update.message.reply_text(
-                    "❌ Please specify a repository: `/commits owner/repo`",
-                    parse_mode=ParseMode.MARKDOWN
-                )
+            parsed = await self._parse_repo_command(update, "/commits owner/repo")
+            if not parsed:
                 return
             
-            repo_path = parts[1]
-            if '/' not in repo_path:
-                await update.message.reply_text(
-                    "❌ Invalid format. Use: `/commits owner/repo`",
-                    parse_mode=ParseMode.MARKDOWN
-                )
-                return
-            
-            owner, repo = repo_path.split('/', 1)
-            commits = self.github_client.get_repository_commits(owner, repo, limit=5)
+            owner, repo = parsed
+            repo_path = f"{owner}/{repo}"
+            commits = await self.github_client.get_repository_commits(owner, repo, limit=5)
             if not commits:
-                await update.message.reply_text(
-                    f"❌ No commits found for `{repo_path}` or API error occurred.",
-                    parse_mode=ParseMode.MARKDOWN
-                )
+                await self._reply(update, f"❌ No commits found for `{repo_path}` or API error occurred.")
                 return
             
-            message = f"📝 **Recent Commits for {repo_path}:**\n\n"
+            parts = [f"📝 **Recent Commits for {repo_path}:**\n\n"]
             for commit in commits:
                 commit_info = commit.get('commit', {})
                 author = commit_info.get('author', {})
@@ -395,18 +464,17 @@ class TelegramBot:
                 sha = commit.get('sha', '')[:7]
                 url = commit.get('html_url', '')
                 
-                message += f"🔸 **{escape_markdown(message_text)}**\n"
-                message += f"👤 {escape_markdown(author_name)} • 🕒 {date_str}\n"
-                message += f"🔗 [`{sha}`]({url})\n\n"
+                parts.append(
+                    f"🔸 **{escape_markdown(message_text)}**\n"
+                    f"👤 {escape_markdown(author_name)} • 🕒 {date_str}\n"
+                    f"🔗 [`{sha}`]({url})\n\n"
+                )
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await self._reply(update, "".join(parts), preview=False)
             
         except Exception as e:
             logger.error(f"Error in commits command: {e}")
-            await update.message.reply_text(
-                "❌ An error occurred while fetching commits.",
-                parse_mode=ParseMode.MARKDOWN
-            )
+            await self._reply(update, "❌ An error occurred while fetching commits.")
 
     async def issues_command(self, update: Update, context=None):
         """Handle /issues command."""
@@ -415,33 +483,18 @@ class TelegramBot:
             
         try:
             # Extract repo path from message text
-            message_text = update.message.text
-            parts = message_text.split()
-            if len(parts) < 2:
-                await update.message.reply_text(
-                    "❌ Please specify a repository: `/issues owner/repo`",
-                    parse_mode=ParseMode.MARKDOWN
-                )
-                return
-            
-            repo_path = parts[1]
-            if '/' not in repo_path:
-                await update.message.reply_text(
-                    "❌ Invalid format. Use: `/issues owner/repo`",
-                    parse_mode=ParseMode.MARKDOWN
-                )
+            parsed = await self._parse_repo_command(update, "/issues owner/repo")
+            if not parsed:
                 return
             
-            owner, repo = repo_path.split('/', 1)
-            issues = self.github_client.get_repository_issues(owner, repo, limit=5)
+            owner, repo = parsed
+            repo_path = f"{owner}/{repo}"
+            issues = await self.github_client.get_repository_issues(owner, repo, limit=5)
             if not issues:
-                await update.message.reply_text(
-                    f"❌ No issues found for `{repo_path}` or API error occurred.",
-                    parse_mode=ParseMode.MARKDOWN
-                )
+                await self._reply(update, f"❌ No issues found for `{repo_path}` or API error occurred.")
                 return
             
-            message = f"🐛 **Issues for {repo_path}:**\n\n"
+            parts = [f"🐛 **Issues for {repo_path}:**\n\n"]
             for issue in issues:
                 title = issue.get('title', 'No title')
                 number = issue.get('number', 0)
@@ -450,18 +503,17 @@ class TelegramBot:
                 url = issue.get('html_url', '')
                 
                 state_emoji = "🟢" if state == "open" else "🔴"
-                message += f"{state_emoji} **#{number}: {escape_markdown(title)}**\n"
-                message += f"👤 {escape_markdown(user)} • 📋 {state}\n"
-                message += f"🔗 [View Issue]({url})\n\n"
+                parts.append(
+                    f"{state_emoji} **#{number}: {escape_markdown(title)}**\n"
+                    f"👤 {escape_markdown(user)} • 📋 {state}\n"
+                    f"🔗 [View Issue]({url})\n\n"
+                )
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await self._reply(update, "".join(parts), preview=False)
             
         except Exception as e:
             logger.error(f"Error in issues command: {e}")
-            await update.message.reply_text(
-                "❌ An error occurred while fetching issues.",
-                parse_mode=ParseMode.MARKDOWN
-            )
+            await self._reply(update, "❌ An error occurred while fetching issues.")
 
     async def search_command(self, update: Update, context=None):
         """Handle /search command."""
@@ -470,25 +522,17 @@ class TelegramBot:
             
         try:
             # Extract search query from message text
-            message_text = update.message.text
-            parts = message_text.split(maxsplit=1)
-            if len(parts) < 2:
-                await update.message.reply_text(
-                    "❌ Please specify a search query: `/search <query>`",
-                    parse_mode=ParseMode.MARKDOWN
-                )
+            query = extract_command_tail(update.message.text)
+            if not query:
+                await self._reply(update, "❌ Please specify a search query: `/search <query>`")
                 return
             
-            query = parts[1]
-            repositories = self.github_client.search_repositories(query, limit=8)
+            repositories = await self.github_client.search_repositories(query, limit=8)
             if not repositories:
-                await update.message.reply_text(
-                    f"❌ No repositories found for query: `{query}`",
-                    parse_mode=ParseMode.MARKDOWN
-                )
+                await self._reply(update, f"❌ No repositories found for query: `{query}`")
                 return
             
-            message = f"🔍 **Search Results for: {escape_markdown(query)}**\n\n"
+            parts = [f"🔍 **Search Results for: {escape_markdown(query)}**\n\n"]
             for repo in repositories:
                 name = repo.get('name', 'Unknown')
                 full_name = repo.get('full_name', 'Unknown')
@@ -496,19 +540,18 @@ class TelegramBot:
                 stars = repo.get('stargazers_count', 0)
                 url = repo.get('html_url', '')
                 
-                message += f"📦 **{escape_markdown(name)}**\n"
-                message += f"🔗 {escape_markdown(full_name)}\n"
-                message += f"📝 {escape_markdown(description[:100])}{'...' if len(description) > 100 else ''}\n"
-                message += f"⭐ {stars} stars • [View]({url})\n\n"
+                parts.append(
+                    f"📦 **{escape_markdown(name)}**\n"
+                    f"🔗 {escape_markdown(full_name)}\n"
+                    f"📝 {escape_markdown(description[:100])}{'...' if len(description) > 100 else ''}\n"
+                    f"⭐ {stars} stars • [View]({url})\n\n"
+                )
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await self._reply(update, "".join(parts), preview=False)
             
         except Exception as e:
             logger.error(f"Error in search command: {e}")
-            await update.message.reply_text(
-                "❌ An error occurred while searching repositories.",
-                parse_mode=ParseMode.MARKDOWN
-            )
+            await self._reply(update, "❌ An error occurred while searching repositories.")
 
     async def status_command(self, update: Update, context=None):
         """Handle /status command."""
@@ -517,7 +560,7 @@ class TelegramBot:
             
         try:
             # Get GitHub API rate limit info
-            rate_limit_info = self.github_client.get_rate_limit()
+            rate_limit_info = await self.github_client.get_rate_limit()
             
             message = "📊 **Bot Status**\n\n"
             message += f"🤖 **Bot:** Running\n"
@@ -537,14 +580,11 @@ class TelegramBot:
             message += f"• Rate limit: {self.config.rate_limit_requests} req/{self.config.rate_limit_window}s\n"
             message += f"• Notifications: {'Enabled' if self.config.notify_on_push else 'Disabled'}\n"
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await self._reply(update, message)
             
         except Exception as e:
             logger.error(f"Error in status command: {e}")
-            await update.message.reply_text(
-                "❌ An error occurred while fetching status.",
-                parse_mode=ParseMode.MARKDOWN
-            )
+            await self._reply(update, "❌ An error occurred while fetching status.")
 
     async def handle_message(self, update: Update):
         """Handle incoming messages."""
@@ -554,71 +594,198 @@ class TelegramBot:
                 
             message_text = update.message.text
             
-            if message_text.startswith('/start'):
-                await self.start_command(update)
-            elif message_text.startswith('/help'):
-                await self.help_command(update)
-            elif message_text.startswith('/profile'):
-                await self.profile_command(update)
-            elif message_text.startswith('/repos'):
-                await self.repos_command(update)
-            elif message_text.startswith('/repo'):
-                await self.repo_command(update)
-            elif message_text.startswith('/commits'):
-                await self.commits_command(update)
-            elif message_text.startswith('/issues'):
-                await self.issues_command(update)
-            elif message_text.startswith('/search'):
-                await self.search_command(update)
-            elif message_text.startswith('/status'):
-                await self.status_command(update)
+            # Exact command token, without any @botname suffix
+            parts = message_text.split(None, 1)
+            command = parts[0].split('@', 1)[0] if parts else ''
+            handler = self._handlers.get(command)
+            
+            if handler:
+                await handler(update)
             else:
                 if await self.check_permissions(update):
-                    await update.message.reply_text(
-                        "❌ Unknown command. Use /help to see available commands.",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
+                    await self._reply(update, "❌ Unknown command. Use /help to see available commands.")
                     
         except Exception as e:
             logger.error(f"Error handling message: {e}")
             try:
-                await update.message.reply_text(
-                    "❌ An error occurred while processing your message.",
-                    parse_mode=ParseMode.MARKDOWN
-                )
+                await self._reply(update, "❌ An error occurred while processing your message.")
             except:
                 pass
 
+    async def _send_markdown(self, chat_id, text):
+        """Send one Markdown message within the outbound rate limit."""
+        await self._throttle_send()
+        await self.bot.send_message(
+            chat_id=chat_id,
+            text=text,
+            parse_mode=ParseMode.MARKDOWN
+        )
+
+    async def _send_one(self, chat_id, message):
+        """Send a notification to one chat, logging instead of raising on failure."""
+        try:
+            await self._send_markdown(chat_id, message)
+        except Exception as e:
+            logger.error(f"Failed to send notification to {chat_id}: {e}")
+
+    async def _send_chunk(self, chat_id, chunk):
+        """
+        Send notifications packed into one message.
+        
+        If Telegram rejects the packed message, e.g. because one notification's
+        Markdown does not parse, each notification is retried on its own so only
+        the offending one is lost.
+        
+        Args:
+            chat_id: Chat to notify
+            chunk: Notifications whose joined length fits in one message
+        """
+        if len(chunk) > 1:
+            try:
+                await self._send_markdown(chat_id, NOTIFICATION_SEPARATOR.join(chunk))
+                return
+            except BadRequest as e:
+                logger.warning(f"Packed notifications rejected for {chat_id}, sending individually: {e}")
+            except Exception as e:
+                logger.error(f"Failed to send notification to {chat_id}: {e}")
+                return
+        for message in chunk:
+            await self._send_one(chat_id, message)
+
     async def send_notification(self, chat_ids, message):
-        """Send notification to specified chat IDs."""
+        """Queue a notification for the specified chat IDs (see queue_notification)."""
+        self.queue_notification(chat_ids, message)
+
+    def queue_notification(self, chat_ids, message):
+        """
+        Queue a notification for the specified chat IDs without blocking.
+        
+        Safe to call from any thread; the bot's flusher batches queued
+        notifications per chat and sends them on the bot's event loop.
+        
+        Args:
+            chat_ids: Chats to notify
+            message: Markdown notification text
+        """
+        loop = self.loop
+        if loop is None or not loop.is_running():
+            raise RuntimeError("Telegram bot event loop is not running")
+        loop.call_soon_threadsafe(self._enqueue, tuple(chat_ids), message)
+
+    def _enqueue(self, chat_ids, message):
+        """Add a notification to each chat's outbox, flushing full outboxes early."""
         for chat_id in chat_ids:
+            pending = self._outbox[chat_id]
+            pending.append(message)
+            if len(pending) >= NOTIFICATION_BUFFER_SIZE:
+                del self._outbox[chat_id]
+                self._track(self._send_batch(chat_id, pending), self._batch_sends)
+
+    async def _send_batch(self, chat_id, messages):
+        """
+        Send queued notifications to one chat, packed into as few messages as fit.
+        
+        A notification longer than one message is sent on its own; Markdown is
+        never cut, so Telegram may reject it, which is logged.
+        """
+        chunk = []
+        size = 0
+        for message in messages:
+            added = len(message) + (len(NOTIFICATION_SEPARATOR) if chunk else 0)
+            if chunk and size + added > MAX_MESSAGE_LENGTH:
+                await self._send_chunk(chat_id, chunk)
+                chunk = []
+                added = len(message)
+                size = 0
+            chunk.append(message)
+            size += added
+        if chunk:
+            await self._send_chunk(chat_id, chunk)
+
+    async def _drain_outbox(self):
+        """Send everything currently waiting in the outbox."""
+        if not self._outbox:
+            return
+        outbox, self._outbox = self._outbox, defaultdict(list)
+        sends = [
+            self._track(self._send_batch(chat_id, messages), self._batch_sends)
+            for chat_id, messages in outbox.items()
+        ]
+        # wait() rather than gather(): cancelling the flusher must not cancel
+        # sends for notifications already taken off the outbox
+        await asyncio.wait(sends)
+
+    async def _flush_notifications(self):
+        """Periodically send notifications buffered in the outbox."""
+        while True:
+            await asyncio.sleep(NOTIFICATION_FLUSH_INTERVAL)
+            await self._drain_outbox()
+
+    async def _safe_handle(self, update: Update):
+        """Handle one update as a task, bounded by the concurrency limit."""
+        async with self._handler_slots:
             try:
-                await self.bot.send_message(
-                    chat_id=chat_id,
-                    text=message,
-                    parse_mode=ParseMode.MARKDOWN
-                )
+                await self.handle_message(update)
             except Exception as e:
-                logger.error(f"Failed to send notification to {chat_id}: {e}")
+                logger.error(f"Error handling update {update.update_id}: {e}")
+
+    async def _sweep_cache(self):
+        """Periodically drop expired GitHub responses from the client cache."""
+        while True:
+            await asyncio.sleep(CACHE_SWEEP_INTERVAL)
+            removed = self.github_client.prune_cache()
+            if removed:
+                logger.debug(f"Pruned {removed} expired GitHub cache entries")
+
+    def _claim_loop(self):
+        """
+        Publish the running loop and main task so stop() can cancel them.
+        
+        Returns:
+            False if stop() was requested before the loop existed
+        """
+        # Publish first, then check: a stop() before this point sets the flag,
+        # one after it cancels the published task
+        self.loop = asyncio.get_running_loop()
+        self._main_task = asyncio.current_task()
+        if self._stop_requested:
+            logger.info("Telegram bot stopped before it started")
+            self.loop = None
+            self._main_task = None
+            return False
+        return True
 
     async def run_polling(self):
         """Run the bot with long polling."""
+        if not self._claim_loop():
+            return
         logger.info("Starting Telegram bot polling...")
         self.running = True
+        background = self._start_background()
         last_update_id = 0
         
         try:
+            # getUpdates is refused while a webhook from a previous run is registered
+            try:
+                await self.bot.delete_webhook()
+            except Exception as e:
+                logger.error(f"Failed to remove Telegram webhook: {e}")
+            
             while self.running:
                 try:
                     # Get updates with offset
                     updates = await self.bot.get_updates(
                         offset=last_update_id + 1,
-                        timeout=10
+                        timeout=POLL_TIMEOUT,
+                        limit=POLL_BATCH_SIZE,
+                        allowed_updates=['message']
                     )
                     
                     for update in updates:
                         if update.message:
-                            await self.handle_message(update)
+                            # Handle concurrently so a slow command does not
+                            # stall polling for everyone else
+                            self._dispatch(update)
                         # Update the last processed update ID
                         last_update_id = update.update_id
                         
@@ -632,17 +799,137 @@ class TelegramBot:
             logger.error(f"Fatal error in bot: {e}")
             raise
         finally:
-            self.running = False
+            await self._teardown(background)
+
+    async def run_webhook(self):
+        """Run the bot with updates delivered by a Telegram webhook."""
+        if not self._claim_loop():
+            return
+        logger.info("Starting Telegram bot in webhook mode...")
+        self.running = True
+        background = self._start_background()
+        
+        try:
+            await self.bot.set_webhook(
+                url=self.config.telegram_webhook_url,
+                allowed_updates=['message'],
+                secret_token=self.config.telegram_webhook_secret
+            )
+            logger.info(f"Telegram webhook registered at {self.config.telegram_webhook_url}")
+            
+            # Updates arrive through feed_update; idle until stop() cancels us
+            await asyncio.Event().wait()
+        except Exception as e:
+            logger.error(f"Fatal error in bot: {e}")
+            raise
+        finally:
+            await self._teardown(background)
+
+    def _start_background(self):
+        """Start the periodic cache sweeper and notification flusher."""
+        return [
+            asyncio.create_task(self._sweep_cache()),
+            asyncio.create_task(self._flush_notifications()),
+        ]
+
+    async def _teardown(self, background):
+        """Cancel background work, send queued notifications and release the GitHub connection pool."""
+        self.running = False
+        self.loop = None
+        self._main_task = None
+        for task in background:
+            task.cancel()
+        # Only update handlers are cancelled; batches in flight are finished
+        # before the rest of the outbox is drained
+        for task in list(self._pending):
+            task.cancel()
+        await asyncio.gather(*background, *self._pending, return_exceptions=True)
+        await asyncio.gather(*self._batch_sends, return_exceptions=True)
+        await self._drain_outbox()
+        await self.github_client.aclose()
+
+    def _track(self, coro, tasks=None):
+        """
+        Run a coroutine in a background task tracked for shutdown.
+        
+        Args:
+            coro: Coroutine to run
+            tasks: Set to track the task in; defaults to the update handlers
+            
+        Returns:
+            The created task
+        """
+        if tasks is None:
+            tasks = self._pending
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        return task
+
+    def _dispatch(self, update: Update):
+        """Handle an update in a background task tracked for shutdown."""
+        self._track(self._safe_handle(update))
+
+    def _accept_update(self, data):
+        """Decode a webhook update on the event loop and dispatch it."""
+        try:
+            update = Update.de_json(data, self.bot)
+        except Exception as e:
+            logger.error(f"Invalid Telegram update: {e}")
+            return
+        if update and update.message:
+            self._dispatch(update)
+
+    def feed_update(self, data):
+        """
+        Queue a Telegram webhook update from another thread without waiting for it.
+        
+        Args:
+            data: Decoded update JSON
+        """
+        if not self.config.telegram_webhook_url:
+            raise RuntimeError("Telegram webhook mode is not enabled")
+        loop = self.loop
+        if loop is None or not loop.is_running():
+            raise RuntimeError("Telegram bot event loop is not running")
+        loop.call_soon_threadsafe(self._accept_update, data)
+
+    def run_coroutine(self, coro, timeout=10):
+        """
+        Run a coroutine on the bot's event loop from another thread.
+        
+        Args:
+            coro: Coroutine to schedule
+            timeout: Seconds to wait for the result
+            
+        Returns:
+            The coroutine's result
+        """
+        loop = self.loop
+        if loop is None or not loop.is_running():
+            coro.close()
+            raise RuntimeError("Telegram bot event loop is not running")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
 
     def start(self):
         """Start the Telegram bot."""
+        runner = self.run_webhook if self.config.telegram_webhook_url else self.run_polling
         try:
-            asyncio.run(self.run_polling())
+            asyncio.run(runner())
+        except asyncio.CancelledError:
+            logger.info("Telegram bot cancelled")
         except Exception as e:
             logger.error(f"Error starting bot: {e}")
             raise
 
     def stop(self):
         """Stop the Telegram bot."""
+        self._stop_requested = True
         self.running = False
         logger.info("Stopping Telegram bot...")
+        
+        # Interrupt a pending get_updates long poll (or the idle webhook
+        # wait) instead of waiting it out
+        loop, task = self.loop, self._main_task
+        if loop is not None and task is not None and loop.is_running():
+            loop.call_soon_threadsafe(task.cancel)
@@ -3,12 +3,72 @@ Utility functions for the GitHub-Telegram Sync Bot.
 """
 
 import re
+import json
+import atexit
+import queue
 import logging
-from datetime import datetime
+import logging.handlers
+import functools
+import threading
+from datetime import datetime, timezone
 from typing import Union
+from waitress.server import MultiSocketServer
+from waitress.trigger import trigger as WaitressTrigger
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib json module
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Decode JSON from bytes or str; orjson raises a json.JSONDecodeError subclass
+json_loads = orjson.loads if orjson is not None else json.loads
+
+def json_dumps(obj) -> bytes:
+    """
+    Encode an object as compact UTF-8 JSON.
+    
+    Args:
+        obj: JSON-serializable object
+        
+    Returns:
+        Encoded JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_log_listener = None
+
+# Characters that need to be escaped in MarkdownV2, as a translate() table
+_MD_ESCAPE_TABLE = str.maketrans({char: '\\' + char for char in '_*[]()~`>#+-=|{}.!'})
+# The same characters as a class, to detect text that needs no escaping
+_MD_ESCAPE_SCAN = re.compile(r'[_*\[\]()~`>#+\-=|{}.!]')
+
+# Display format for timestamps; Unix timestamps are rendered in UTC
+_UTC = timezone.utc
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M UTC'
+
+# Units for format_file_size, each 1024 times the previous
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# GitHub owner/repository name component
+_REPO_PART_RE = re.compile(r'^[a-zA-Z0-9._-]+$')
+
+# Characters not allowed in filenames
+_FILENAME_INVALID_RE = re.compile(r'[<>:"/\\|?*]')
+
+# GitHub username rules:
+# - May only contain alphanumeric characters or single hyphens
+# - Cannot begin or end with a hyphen
+# - Maximum 39 characters
+_GITHUB_USERNAME_RE = re.compile(r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,37}[a-zA-Z0-9])?$')
+
+# Author, user and repository names repeat across list replies and notifications
+@functools.lru_cache(maxsize=4096)
 def escape_markdown(text: str) -> str:
     """
     Escape special characters for Telegram MarkdownV2.
@@ -22,15 +82,15 @@ def escape_markdown(text: str) -> str:
     if not text:
         return ""
     
-    # Characters that need to be escaped in MarkdownV2
-    special_chars = r'_*[]()~`>#+-=|{}.!'
-    
-    # Escape each special character
-    for char in special_chars:
-        text = text.replace(char, f'\\{char}')
+    # Names and SHAs are usually clean; translate() always copies, the scan
+    # stops at the first special character
+    if _MD_ESCAPE_SCAN.search(text) is None:
+        return text
     
-    return text
+    # Single C-level pass over the text, without regex match objects
+    return text.translate(_MD_ESCAPE_TABLE)
 
+@functools.lru_cache(maxsize=1024)
 def format_timestamp(timestamp: Union[str, int], is_timestamp: bool = False) -> str:
     """
     Format timestamp for display.
@@ -44,16 +104,16 @@ def format_timestamp(timestamp: Union[str, int], is_timestamp: bool = False) ->
     """
     try:
         if is_timestamp:
-            # Unix timestamp
-            dt = datetime.fromtimestamp(int(timestamp))
+            # Unix timestamp, converted straight to UTC rather than local time
+            if not isinstance(timestamp, (int, float)):
+                timestamp = int(timestamp)
+            dt = datetime.fromtimestamp(timestamp, _UTC)
         else:
-            # ISO timestamp string
-            # Handle GitHub's ISO format with Z suffix
-            if timestamp.endswith('Z'):
-                timestamp = timestamp[:-1] + '+00:00'
+            # ISO timestamp string; fromisoformat accepts GitHub's Z suffix
+            # natively since Python 3.11
             dt = datetime.fromisoformat(timestamp)
         
-        return dt.strftime('%Y-%m-%d %H:%M UTC')
+        return dt.strftime(_TIMESTAMP_FORMAT)
         
     except (ValueError, TypeError) as e:
         logger.warning(f"Failed to format timestamp {timestamp}: {e}")
@@ -96,7 +156,7 @@ def validate_repo_path(repo_path: str) -> tuple:
     owner, repo = parts
     
     # Basic validation - GitHub usernames and repo names
-    if not re.match(r'^[a-zA-Z0-9._-]+$', owner) or not re.match(r'^[a-zA-Z0-9._-]+$', repo):
+    if not _REPO_PART_RE.match(owner) or not _REPO_PART_RE.match(repo):
         return None, None
     
     return owner, repo
@@ -111,18 +171,16 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted size string
     """
-    if size_bytes == 0:
+    # bit_length() is int-only; sizes from JSON or arithmetic may be floats
+    whole_bytes = int(size_bytes)
+    if whole_bytes <= 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    size = float(size_bytes)
-    
-    while size >= 1024.0 and i < len(size_names) - 1:
-        size /= 1024.0
-        i += 1
+    # floor(log2(size)) // 10 is the largest unit that does not exceed the size
+    i = min((whole_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    size = size_bytes / (1 << (10 * i))
     
-    return f"{size:.1f} {size_names[i]}"
+    return f"{size:.1f} {_SIZE_UNITS[i]}"
 
 def sanitize_filename(filename: str) -> str:
     """
@@ -135,7 +193,7 @@ def sanitize_filename(filename: str) -> str:
         Sanitized filename
     """
     # Remove or replace invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = _FILENAME_INVALID_RE.sub('_', filename)
     filename = filename.strip()
     
     # Ensure filename is not too long
@@ -157,12 +215,7 @@ def is_valid_github_username(username: str) -> bool:
     if not username:
         return False
     
-    # GitHub username rules:
-    # - May only contain alphanumeric characters or single hyphens
-    # - Cannot begin or end with a hyphen
-    # - Maximum 39 characters
-    pattern = r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,37}[a-zA-Z0-9])?$'
-    return bool(re.match(pattern, username))
+    return bool(_GITHUB_USERNAME_RE.match(username))
 
 def format_duration(seconds: int) -> str:
     """
@@ -199,8 +252,101 @@ def extract_command_args(message_text: str) -> list:
     Returns:
         List of command arguments (excluding the command itself)
     """
+    tail = extract_command_tail(message_text)
+    return tail.split() if tail else []
+
+def extract_command_tail(message_text: str) -> str:
+    """
+    Extract everything after the command as a single string.
+    
+    Args:
+        message_text: Full message text
+        
+    Returns:
+        Argument text with surrounding whitespace removed, or an empty string
+    """
     if not message_text:
-        return []
+        return ""
+    
+    # Only separate the command; the rest of the message is never tokenized
+    parts = message_text.split(None, 1)
+    return parts[1].rstrip() if len(parts) == 2 else ""
+
+def setup_logging(log_file: str = 'bot.log', level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Configure root logging to write through a background queue listener.
+    
+    Log calls only enqueue the record; a listener thread writes to the
+    console and to a size-bounded rotating log file.
+    
+    Args:
+        log_file: Path of the rotating log file
+        level: Root logger level
+        
+    Returns:
+        The running queue listener (created once per process)
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return _log_listener
+    
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=10_000_000, backupCount=5
+    )
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, file_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    return _log_listener
+
+def stop_waitress_server(server, timeout: float = 10) -> bool:
+    """
+    Stop a waitress server whose run() loop is executing in another thread.
+    
+    waitress's loop only returns once its socket map is empty, so closing just
+    the listener leaves keep-alive connections serving forever, and closing
+    sockets from this thread races with the loop's select(). The shutdown is
+    therefore handed to the loop thread through the server's trigger.
+    
+    Args:
+        server: Server returned by waitress.create_server
+        timeout: Seconds to wait for the loop thread to run the shutdown
+        
+    Returns:
+        True if the server loop was stopped, False if it did not respond in time
+    """
+    socket_map = server.map if isinstance(server, MultiSocketServer) else server._map
+    triggers = [d for d in socket_map.values() if isinstance(d, WaitressTrigger)]
+    done = threading.Event()
+    
+    def close_all():
+        # Drop the listeners and client channels first so busy workers see
+        # disconnects, let the workers finish while the trigger they wake the
+        # loop with is still open, then empty the map so run() returns
+        for dispatcher in list(socket_map.values()):
+            if not isinstance(dispatcher, WaitressTrigger):
+                dispatcher.close()
+        server.task_dispatcher.shutdown()
+        socket_map.clear()
+        done.set()
+    
+    triggers[0].pull_trigger(close_all)
+    if not done.wait(timeout):
+        return False
     
-    parts = message_text.strip().split()
-    return parts[1:] if len(parts) > 1 else []
+    # The loop no longer selects on the triggers, and the callback may have
+    # run before pull_trigger() finished writing, so close them only now
+    for trigger in triggers:
+        trigger.close()
+    return True
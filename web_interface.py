@@ -3,12 +3,18 @@ Flask web interface for bot management and monitoring.
 """
 
 import logging
-from flask import Flask, render_template, jsonify, request
-from datetime import datetime
+import threading
+import time
+from flask import Flask, Response, render_template, jsonify, request
+from waitress import create_server
+from utils import json_dumps, stop_waitress_server
 import json
 
 logger = logging.getLogger(__name__)
 
+# UTC timestamp format for API responses
+_ISO_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
 class WebInterface:
     """Web interface for bot management."""
     
@@ -22,7 +28,37 @@ class WebInterface:
         """
         self.config = config
         self.telegram_bot = telegram_bot
+        
+        # Configuration does not change at runtime, so its views are built once
+        notifications = {
+            'push': config.notify_on_push,
+            'issues': config.notify_on_issues,
+            'pull_requests': config.notify_on_pull_requests,
+            'releases': config.notify_on_releases
+        }
+        self._status_config = {
+            'github_username': config.github_username,
+            'allowed_chats': len(config.allowed_chat_ids),
+            'rate_limit': f"{config.rate_limit_requests}/{config.rate_limit_window}s",
+            'notifications': notifications
+        }
+        self._config_info = {
+            'github_username': config.github_username,
+            'webhook_url': config.get_webhook_url(),
+            'allowed_chats_count': len(config.allowed_chat_ids),
+            'rate_limiting': {
+                'requests': config.rate_limit_requests,
+                'window': config.rate_limit_window
+            },
+            'notifications': notifications
+        }
+        self._config_json = json_dumps(self._config_info)
+        
         self.app = Flask(__name__)
+        self.server = None
+        # Guards server creation against a concurrent shutdown_server()
+        self._server_lock = threading.Lock()
+        self._shutting_down = False
         self.setup_routes()
     
     def setup_routes(self):
@@ -46,7 +82,7 @@ class WebInterface:
         
         @self.app.route('/api/config')
         def api_config():
-            return jsonify(self.get_config_info())
+            return Response(self._config_json, mimetype='application/json')
         
         @self.app.route('/health')
         def health_check():
@@ -54,28 +90,28 @@ class WebInterface:
     
     def get_bot_status(self):
         """Get current bot status information."""
+        timestamp = time.strftime(_ISO_FORMAT, time.gmtime())
         try:
             # Get GitHub API rate limit
-            rate_limit_info = self.telegram_bot.github_client.get_rate_limit()
+            # The GitHub client lives on the bot's event loop
+            try:
+                rate_limit_info = self.telegram_bot.run_coroutine(
+                    self.telegram_bot.github_client.get_rate_limit()
+                )
+            except (RuntimeError, TimeoutError) as e:
+                # Bot not started yet, stopped, or too busy to answer; the
+                # dashboard polls this, so report it as disconnected quietly
+                logger.debug(f"GitHub rate limit unavailable: {e!r}")
+                rate_limit_info = None
             
             status_data = {
                 'bot_running': self.telegram_bot.running,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': timestamp,
                 'github_api': {
                     'connected': bool(rate_limit_info),
                     'rate_limit': rate_limit_info.get('rate', {}) if rate_limit_info else None
                 },
-                'configuration': {
-                    'github_username': self.config.github_username,
-                    'allowed_chats': len(self.config.allowed_chat_ids),
-                    'rate_limit': f"{self.config.rate_limit_requests}/{self.config.rate_limit_window}s",
-                    'notifications': {
-                        'push': self.config.notify_on_push,
-                        'issues': self.config.notify_on_issues,
-                        'pull_requests': self.config.notify_on_pull_requests,
-                        'releases': self.config.notify_on_releases
-                    }
-                }
+                'configuration': self._status_config
             }
             
             return status_data
@@ -84,36 +120,47 @@ class WebInterface:
             logger.error(f"Error getting bot status: {e}")
             return {
                 'error': 'Failed to get bot status',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
     
     def get_config_info(self):
         """Get configuration information (sanitized)."""
-        return {
-            'github_username': self.config.github_username,
-            'webhook_url': self.config.get_webhook_url(),
-            'allowed_chats_count': len(self.config.allowed_chat_ids),
-            'rate_limiting': {
-                'requests': self.config.rate_limit_requests,
-                'window': self.config.rate_limit_window
-            },
-            'notifications': {
-                'push': self.config.notify_on_push,
-                'issues': self.config.notify_on_issues,
-                'pull_requests': self.config.notify_on_pull_requests,
-                'releases': self.config.notify_on_releases
-            }
-        }
+        return self._config_info
     
-    def run_server(self):
-        """Run the web interface server."""
+    def run_server(self, ready=None):
+        """
+        Run the web interface server.
+        
+        Args:
+            ready: Optional threading.Event set once the listening socket is bound
+        """
         try:
             logger.info(f"Starting web interface on {self.config.web_host}:{self.config.web_port}")
-            self.app.run(
-                host=self.config.web_host,
-                port=self.config.web_port,
-                debug=self.config.debug_mode
-            )
+            self.app.debug = self.config.debug_mode
+            # Production WSGI server; create_server binds the socket up front,
+            # so readiness can be signalled before serving starts
+            with self._server_lock:
+                # Shut down before the server existed; never start serving
+                if self._shutting_down:
+                    return
+                server = self.server = create_server(
+                    self.app,
+                    host=self.config.web_host,
+                    port=self.config.web_port,
+                    threads=self.config.server_threads
+                )
+            if ready is not None:
+                ready.set()
+            server.run()
         except Exception as e:
             logger.error(f"Error running web interface: {e}")
             raise
+    
+    def shutdown_server(self):
+        """Stop the server loop started by run_server."""
+        with self._server_lock:
+            self._shutting_down = True
+            server, self.server = self.server, None
+        if server is not None:
+            if not stop_waitress_server(server):
+                logger.warning("Web interface server did not stop in time")
@@ -4,15 +4,22 @@ Webhook handler for processing GitHub events.
 
 import json
 import hmac
-import hashlib
 import logging
+import threading
+from types import MappingProxyType
 from flask import Flask, request, jsonify
-import asyncio
-from threading import Thread
-from utils import escape_markdown, format_timestamp
+from werkzeug.exceptions import RequestEntityTooLarge
+from waitress import create_server
+from utils import escape_markdown, format_timestamp, json_loads, stop_waitress_server, truncate_text
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only stand-in for missing payload objects
+_EMPTY = MappingProxyType({})
+
+# Longest commit subject line shown in push notifications
+COMMIT_SUBJECT_LENGTH = 120
+
 class WebhookHandler:
     """Handles GitHub webhook events and forwards notifications to Telegram."""
     
@@ -26,7 +33,28 @@ class WebhookHandler:
         """
         self.config = config
         self.telegram_bot = telegram_bot
+        # Webhook secret encoded once for signature checks
+        secret = config.github_webhook_secret
+        self._hmac_key = secret.encode('utf-8') if secret else None
+        
+        # Event type -> formatter; events with notifications disabled are left out
+        self._formatters = {'ping': self.format_ping_event}
+        for event_type, formatter in (
+            ('push', self.format_push_event),
+            ('issues', self.format_issues_event),
+            ('pull_request', self.format_pull_request_event),
+            ('release', self.format_release_event),
+        ):
+            if config.should_notify(event_type):
+                self._formatters[event_type] = formatter
+        
         self.app = Flask(__name__)
+        # Also bounds bodies sent without a Content-Length (chunked uploads)
+        self.app.config['MAX_CONTENT_LENGTH'] = config.webhook_max_payload
+        self.server = None
+        # Guards server creation against a concurrent shutdown_server()
+        self._server_lock = threading.Lock()
+        self._shutting_down = False
         self.setup_routes()
     
     def setup_routes(self):
@@ -36,6 +64,12 @@ class WebhookHandler:
         def handle_webhook():
             return self.process_webhook()
         
+        # Telegram updates are only accepted in webhook mode
+        if self.config.telegram_webhook_url:
+            @self.app.route('/telegram', methods=['POST'])
+            def handle_telegram_update():
+                return self.process_telegram_update()
+        
         @self.app.route('/health', methods=['GET'])
         def health_check():
             return jsonify({'status': 'healthy', 'service': 'webhook_handler'})
@@ -51,7 +85,7 @@ class WebhookHandler:
         Returns:
             True if signature is valid, False otherwise
         """
-        if not self.config.github_webhook_secret:
+        if not self._hmac_key:
             logger.warning("No webhook secret configured, skipping signature verification")
             return True
         
@@ -63,21 +97,29 @@ class WebhookHandler:
             logger.error("Invalid signature format")
             return False
         
-        expected_signature = hmac.new(
-            self.config.github_webhook_secret.encode('utf-8'),
-            payload_body,
-            hashlib.sha256
-        ).hexdigest()
+        try:
+            signature = bytes.fromhex(signature_header[7:])  # Remove 'sha256=' prefix
+        except ValueError:
+            logger.error("Invalid signature format")
+            return False
         
-        signature = signature_header[7:]  # Remove 'sha256=' prefix
+        # One-shot C implementation compared as raw bytes; no hex encoding
+        expected_signature = hmac.digest(self._hmac_key, payload_body, 'sha256')
         
         return hmac.compare_digest(expected_signature, signature)
     
     def process_webhook(self):
         """Process incoming webhook requests."""
         try:
-            # Get request data
-            payload_body = request.get_data()
+            # Refuse oversized deliveries before reading the body
+            content_length = request.content_length
+            if content_length is not None and content_length > self.config.webhook_max_payload:
+                logger.error(f"Webhook payload too large: {content_length} bytes")
+                return jsonify({'error': 'Payload too large'}), 413
+            
+            # Get request data; the one buffer feeds both the HMAC and the
+            # JSON decoder, and is not kept on the request afterwards
+            payload_body = request.get_data(cache=False)
             signature_header = request.headers.get('X-Hub-Signature-256')
             event_type = request.headers.get('X-GitHub-Event')
             
@@ -88,7 +130,8 @@ class WebhookHandler:
             
             # Parse JSON payload
             try:
-                payload = json.loads(payload_body.decode('utf-8'))
+                # Decode straight from the request bytes (orjson when installed)
+                payload = json_loads(payload_body)
             except json.JSONDecodeError as e:
                 logger.error(f"Invalid JSON payload: {e}")
                 return jsonify({'error': 'Invalid JSON'}), 400
@@ -98,10 +141,39 @@ class WebhookHandler:
             
             return jsonify({'status': 'success'}), 200
             
+        except RequestEntityTooLarge:
+            logger.error("Webhook payload too large")
+            return jsonify({'error': 'Payload too large'}), 413
         except Exception as e:
             logger.error(f"Error processing webhook: {e}")
             return jsonify({'error': 'Internal server error'}), 500
     
+    def process_telegram_update(self):
+        """Hand an incoming Telegram webhook update to the bot's event loop."""
+        # Config guarantees a secret token whenever webhook mode is enabled
+        secret = self.config.telegram_webhook_secret
+        if not secret or not hmac.compare_digest(
+            request.headers.get('X-Telegram-Bot-Api-Secret-Token', '').encode('utf-8'),
+            secret.encode('utf-8')
+        ):
+            logger.error("Invalid Telegram webhook secret token")
+            return jsonify({'error': 'Invalid secret token'}), 403
+        
+        try:
+            data = json_loads(request.get_data(cache=False))
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid Telegram update JSON: {e}")
+            return jsonify({'error': 'Invalid JSON'}), 400
+        
+        try:
+            self.telegram_bot.feed_update(data)
+        except RuntimeError as e:
+            # Telegram redelivers the update once the bot is up
+            logger.error(f"Dropping Telegram update: {e}")
+            return jsonify({'error': 'Bot not running'}), 503
+        
+        return jsonify({'status': 'success'}), 200
+    
     def handle_github_event(self, event_type, payload):
         """
         Handle specific GitHub events.
@@ -111,18 +183,11 @@ class WebhookHandler:
             payload: Event payload
         """
         try:
-            message = None
-            
-            if event_type == 'push' and self.config.notify_on_push:
-                message = self.format_push_event(payload)
-            elif event_type == 'issues' and self.config.notify_on_issues:
-                message = self.format_issues_event(payload)
-            elif event_type == 'pull_request' and self.config.notify_on_pull_requests:
-                message = self.format_pull_request_event(payload)
-            elif event_type == 'release' and self.config.notify_on_releases:
-                message = self.format_release_event(payload)
-            elif event_type == 'ping':
-                message = self.format_ping_event(payload)
+            formatter = self._formatters.get(event_type)
+            if formatter is None:
+                return
+            
+            message = formatter(payload)
             
             if message and self.config.allowed_chat_ids:
                 # Send notification to all allowed chat IDs
@@ -134,39 +199,47 @@ class WebhookHandler:
     def format_push_event(self, payload):
         """Format push event notification."""
         try:
-            repository = payload.get('repository', {})
+            repository = payload.get('repository') or _EMPTY
             repo_name = repository.get('full_name', 'Unknown')
             ref = payload.get('ref', '')
             branch = ref.split('/')[-1] if ref.startswith('refs/heads/') else ref
-            commits = payload.get('commits', [])
-            pusher = payload.get('pusher', {}).get('name', 'Unknown')
+            commits = payload.get('commits') or ()
+            pusher = (payload.get('pusher') or _EMPTY).get('name', 'Unknown')
             
             if not commits:
                 return None
             
-            message = f"🚀 **Push to {escape_markdown(repo_name)}**\n\n"
-            message += f"🌿 **Branch:** {escape_markdown(branch)}\n"
-            message += f"👤 **Pusher:** {escape_markdown(pusher)}\n"
-            message += f"📝 **Commits:** {len(commits)}\n\n"
+            parts = [
+                f"🚀 **Push to {escape_markdown(repo_name)}**\n\n"
+                f"🌿 **Branch:** {escape_markdown(branch)}\n"
+                f"👤 **Pusher:** {escape_markdown(pusher)}\n"
+                f"📝 **Commits:** {len(commits)}\n\n"
+            ]
             
             # Show up to 3 commits
             for commit in commits[:3]:
-                commit_message = commit.get('message', 'No message')
-                author = commit.get('author', {}).get('name', 'Unknown')
+                # Only the subject line is shown, so the body is never escaped or sent
+                commit_message = truncate_text(
+                    (commit.get('message') or 'No message').partition('\n')[0],
+                    COMMIT_SUBJECT_LENGTH
+                )
+                author = (commit.get('author') or _EMPTY).get('name', 'Unknown')
                 sha = commit.get('id', '')[:7]
                 url = commit.get('url', '')
                 
-                message += f"🔸 **{escape_markdown(commit_message)}**\n"
-                message += f"👤 {escape_markdown(author)} • [`{sha}`]({url})\n\n"
+                parts.append(
+                    f"🔸 **{escape_markdown(commit_message)}**\n"
+                    f"👤 {escape_markdown(author)} • [`{sha}`]({url})\n\n"
+                )
             
             if len(commits) > 3:
-                message += f"... and {len(commits) - 3} more commits\n\n"
+                parts.append(f"... and {len(commits) - 3} more commits\n\n")
             
             repo_url = repository.get('html_url', '')
             if repo_url:
-                message += f"🔗 [View Repository]({repo_url})"
+                parts.append(f"🔗 [View Repository]({repo_url})")
             
-            return message
+            return "".join(parts)
             
         except Exception as e:
             logger.error(f"Error formatting push event: {e}")
@@ -176,14 +249,14 @@ class WebhookHandler:
         """Format issues event notification."""
         try:
             action = payload.get('action', 'unknown')
-            issue = payload.get('issue', {})
-            repository = payload.get('repository', {})
+            issue = payload.get('issue') or _EMPTY
+            repository = payload.get('repository') or _EMPTY
             
             repo_name = repository.get('full_name', 'Unknown')
             issue_title = issue.get('title', 'No title')
             issue_number = issue.get('number', 0)
             issue_url = issue.get('html_url', '')
-            user = issue.get('user', {}).get('login', 'Unknown')
+            user = (issue.get('user') or _EMPTY).get('login', 'Unknown')
             
             action_emoji = {
                 'opened': '🆕',
@@ -192,14 +265,16 @@ class WebhookHandler:
                 'edited': '✏️'
             }.get(action, '📋')
             
-            message = f"{action_emoji} **Issue {action} in {escape_markdown(repo_name)}**\n\n"
-            message += f"🐛 **#{issue_number}: {escape_markdown(issue_title)}**\n"
-            message += f"👤 **By:** {escape_markdown(user)}\n"
+            parts = [
+                f"{action_emoji} **Issue {action} in {escape_markdown(repo_name)}**\n\n"
+                f"🐛 **#{issue_number}: {escape_markdown(issue_title)}**\n"
+                f"👤 **By:** {escape_markdown(user)}\n"
+            ]
             
             if issue_url:
-                message += f"🔗 [View Issue]({issue_url})"
+                parts.append(f"🔗 [View Issue]({issue_url})")
             
-            return message
+            return "".join(parts)
             
         except Exception as e:
             logger.error(f"Error formatting issues event: {e}")
@@ -209,14 +284,14 @@ class WebhookHandler:
         """Format pull request event notification."""
         try:
             action = payload.get('action', 'unknown')
-            pull_request = payload.get('pull_request', {})
-            repository = payload.get('repository', {})
+            pull_request = payload.get('pull_request') or _EMPTY
+            repository = payload.get('repository') or _EMPTY
             
             repo_name = repository.get('full_name', 'Unknown')
             pr_title = pull_request.get('title', 'No title')
             pr_number = pull_request.get('number', 0)
             pr_url = pull_request.get('html_url', '')
-            user = pull_request.get('user', {}).get('login', 'Unknown')
+            user = (pull_request.get('user') or _EMPTY).get('login', 'Unknown')
             
             action_emoji = {
                 'opened': '🆕',
@@ -226,14 +301,16 @@ class WebhookHandler:
                 'edited': '✏️'
             }.get(action, '📋')
             
-            message = f"{action_emoji} **Pull Request {action} in {escape_markdown(repo_name)}**\n\n"
-            message += f"🔀 **#{pr_number}: {escape_markdown(pr_title)}**\n"
-            message += f"👤 **By:** {escape_markdown(user)}\n"
+            parts = [
+                f"{action_emoji} **Pull Request {action} in {escape_markdown(repo_name)}**\n\n"
+                f"🔀 **#{pr_number}: {escape_markdown(pr_title)}**\n"
+                f"👤 **By:** {escape_markdown(user)}\n"
+            ]
             
             if pr_url:
-                message += f"🔗 [View Pull Request]({pr_url})"
+                parts.append(f"🔗 [View Pull Request]({pr_url})")
             
-            return message
+            return "".join(parts)
             
         except Exception as e:
             logger.error(f"Error formatting pull request event: {e}")
@@ -243,8 +320,8 @@ class WebhookHandler:
         """Format release event notification."""
         try:
             action = payload.get('action', 'unknown')
-            release = payload.get('release', {})
-            repository = payload.get('repository', {})
+            release = payload.get('release') or _EMPTY
+            repository = payload.get('repository') or _EMPTY
             
             if action != 'published':
                 return None
@@ -253,16 +330,18 @@ class WebhookHandler:
             release_name = release.get('name', 'No name')
             tag_name = release.get('tag_name', 'Unknown')
             release_url = release.get('html_url', '')
-            author = release.get('author', {}).get('login', 'Unknown')
+            author = (release.get('author') or _EMPTY).get('login', 'Unknown')
             
-            message = f"🎉 **New Release in {escape_markdown(repo_name)}**\n\n"
-            message += f"🏷️ **{escape_markdown(release_name)}** ({escape_markdown(tag_name)})\n"
-            message += f"👤 **By:** {escape_markdown(author)}\n"
+            parts = [
+                f"🎉 **New Release in {escape_markdown(repo_name)}**\n\n"
+                f"🏷️ **{escape_markdown(release_name)}** ({escape_markdown(tag_name)})\n"
+                f"👤 **By:** {escape_markdown(author)}\n"
+            ]
             
             if release_url:
-                message += f"🔗 [View Release]({release_url})"
+                parts.append(f"🔗 [View Release]({release_url})")
             
-            return message
+            return "".join(parts)
             
         except Exception as e:
             logger.error(f"Error formatting release event: {e}")
@@ -270,37 +349,52 @@ class WebhookHandler:
     
     def format_ping_event(self, payload):
         """Format ping event notification."""
-        repository = payload.get('repository', {})
+        repository = payload.get('repository') or _EMPTY
         repo_name = repository.get('full_name', 'Unknown')
         
         return f"🏓 **Webhook configured for {escape_markdown(repo_name)}**\n\nWebhook is working correctly!"
     
     def send_notification_async(self, message):
-        """Send notification asynchronously."""
-        def run_async():
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(
-                    self.telegram_bot.send_notification(self.config.allowed_chat_ids, message)
-                )
-                loop.close()
-            except Exception as e:
-                logger.error(f"Error sending notification: {e}")
-        
-        thread = Thread(target=run_async)
-        thread.daemon = True
-        thread.start()
+        """Send notification asynchronously on the Telegram bot's event loop."""
+        try:
+            self.telegram_bot.queue_notification(self.config.allowed_chat_ids, message)
+        except Exception as e:
+            logger.error(f"Error sending notification: {e}")
     
-    def run_server(self):
-        """Run the webhook server."""
+    def run_server(self, ready=None):
+        """
+        Run the webhook server.
+        
+        Args:
+            ready: Optional threading.Event set once the listening socket is bound
+        """
         try:
             logger.info(f"Starting webhook server on {self.config.webhook_host}:{self.config.webhook_port}")
-            self.app.run(
-                host=self.config.webhook_host,
-                port=self.config.webhook_port,
-                debug=self.config.debug_mode
-            )
+            self.app.debug = self.config.debug_mode
+            # Production WSGI server; create_server binds the socket up front,
+            # so readiness can be signalled before serving starts
+            with self._server_lock:
+                # Shut down before the server existed; never start serving
+                if self._shutting_down:
+                    return
+                server = self.server = create_server(
+                    self.app,
+                    host=self.config.webhook_host,
+                    port=self.config.webhook_port,
+                    threads=self.config.server_threads
+                )
+            if ready is not None:
+                ready.set()
+            server.run()
         except Exception as e:
             logger.error(f"Error running webhook server: {e}")
             raise
+    
+    def shutdown_server(self):
+        """Stop the server loop started by run_server."""
+        with self._server_lock:
+            self._shutting_down = True
+            server, self.server = self.server, None
+        if server is not None:
+            if not stop_waitress_server(server):
+                logger.warning("Webhook server did not stop in time")